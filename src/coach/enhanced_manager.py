@@ -61,14 +61,15 @@ class EnhancedCoachManager:
                 "pnl": data["pnl"]
             })
         
-        # Keep only recent history to avoid memory bloat
+        # Keep only recent history to avoid memory bloat (trimmed in place, no list copy)
         if len(self.memory.trade_history) > 100:
-            self.memory.trade_history = self.memory.trade_history[-100:]
+            del self.memory.trade_history[:-100]
         if len(self.memory.portfolio_history) > 300:  # 300 days of history
-            self.memory.portfolio_history = self.memory.portfolio_history[-300:]
-        
-        # Update user behavior patterns based on new data
-        self._update_behavior_patterns()
+            del self.memory.portfolio_history[:-300]
+
+        # Behavior patterns are derived from trades only, so daily snapshots leave them as-is
+        if event_type == "trade":
+            self._update_behavior_patterns()
 
     def _update_behavior_patterns(self) -> None:
         """Update user behavior patterns based on stored history"""
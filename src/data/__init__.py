@@ -1,5 +1,20 @@
 """Market data package"""
+from functools import lru_cache
+from typing import Union
 from src.data.loader import MarketDataLoader
 from src.data.enhanced_loader import EnhancedMarketDataLoader
 
-__all__ = ["MarketDataLoader", "EnhancedMarketDataLoader"]
\ No newline at end of file
+
+@lru_cache(maxsize=None)
+def get_shared_loader() -> Union[EnhancedMarketDataLoader, MarketDataLoader]:
+    """Process-wide loader, built on first use; its in-memory caches outlive any one app"""
+    # Use EnhancedMarketDataLoader for realistic market simulation
+    try:
+        loader = EnhancedMarketDataLoader()
+    except ImportError:
+        # Fallback to basic MarketDataLoader if enhanced version is not available
+        loader = MarketDataLoader()
+    return loader
+
+
+__all__ = ["MarketDataLoader", "EnhancedMarketDataLoader", "get_shared_loader"]
@@ -3,10 +3,11 @@ import yfinance as yf
 import pandas as pd
 import numpy as np
 import random
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 from datetime import datetime, timedelta
-from src.config import DATA_DIR
+from src.config import DATA_DIR, PRELOAD_WORKERS
 
 
 class EnhancedMarketDataLoader:
@@ -17,6 +18,8 @@ class EnhancedMarketDataLoader:
         self.cache_dir.mkdir(exist_ok=True)
         self._cache: Dict[str, pd.DataFrame] = {}
         self._extended_cache: Dict[str, pd.DataFrame] = {}
+        # Memoized deterministic price lookups keyed by (symbol, day_offset, max_days)
+        self._price_cache: Dict[tuple, float] = {}
         
         # Market simulation parameters
         self.market_sentiment = 0.0  # -1 (bearish) to +1 (bullish)
@@ -134,20 +137,32 @@ class EnhancedMarketDataLoader:
 
     def get_current_price(self, symbol: str) -> float:
         """Get latest price for symbol"""
+        key = (symbol, None, 365)
+        price = self._price_cache.get(key)
+        if price is not None:
+            return price
         df = self.get_stock_data(symbol, days=365)  # Standard period
         if df is not None and not df.empty:
-            return float(df['Close'].iloc[-1])
+            price = self._price_cache[key] = float(df['Close'].iloc[-1])
+            return price
         return 0.0
 
     def get_price_at_day(self, symbol: str, day_offset: int, max_days: int = 2000) -> float:
         """Get price at specific day offset from today with extended support"""
+        # Historical closes never change, so only the random-walk branch is recomputed
+        key = (symbol, day_offset, max_days)
+        price = self._price_cache.get(key)
+        if price is not None:
+            return price
+
         # Try to get extended historical data first
         df = self.get_stock_data(symbol, days=max_days)
         if df is not None and not df.empty:
             try:
                 idx = -(day_offset + 1)  # Negative index from end
                 if abs(idx) <= len(df):
-                    return float(df['Close'].iloc[idx])
+                    price = self._price_cache[key] = float(df['Close'].iloc[idx])
+                    return price
             except IndexError:
                 pass
         
@@ -178,6 +193,51 @@ class EnhancedMarketDataLoader:
         
         return self._generate_fallback_price(symbol)
 
+    def get_prices_at_day_safe(
+        self, symbols: List[str], day_offset: Optional[int], max_days: int = 2000
+    ) -> Tuple[Dict[str, float], List[Tuple[str, str]]]:
+        """(prices, failures) for every symbol; a failed lookup is reported, not raised
+
+        Memoized closes skip the DataFrame lookup. day_offset None simulates the next price beyond the loaded history.
+        """
+        cache = self._price_cache
+        prices = {}
+        failures = []
+        for symbol in symbols:
+            try:
+                if day_offset is None:
+                    price = self.get_price_at_day_with_simulation(symbol)
+                else:
+                    price = cache.get((symbol, day_offset, max_days))
+                    if price is None:
+                        price = self.get_price_at_day(symbol, day_offset, max_days)
+                prices[symbol] = price
+            except Exception as e:
+                failures.append((symbol, str(e)))
+        return prices, failures
+
+    def get_prices_bulk(self, symbols: List[str], offsets: List[int], max_days: int = 2000) -> Dict[str, List[float]]:
+        """Prices at each day offset for every symbol, one NumPy gather per symbol
+
+        Offsets beyond the loaded history fall back to get_price_at_day.
+        """
+        offsets_arr = np.asarray(offsets, dtype=np.int64)
+        prices = {}
+        for symbol in symbols:
+            df = self.get_stock_data(symbol, days=max_days)
+            closes = df['Close'].to_numpy() if df is not None else np.empty(0)
+            in_range = offsets_arr < len(closes)
+            picked = iter(closes[-1 - offsets_arr[in_range]].tolist())
+            row = []
+            for offset, ok in zip(offsets, in_range.tolist()):
+                if ok:
+                    price = self._price_cache[(symbol, offset, max_days)] = float(next(picked))
+                else:
+                    price = self.get_price_at_day(symbol, offset, max_days)
+                row.append(price)
+            prices[symbol] = row
+        return prices
+
     def get_price_history(self, symbol: str, days: int = 30) -> List[float]:
         """Get recent price history for sparkline charts"""
         df = self.get_stock_data(symbol, days=days)
@@ -271,6 +331,9 @@ class EnhancedMarketDataLoader:
         ]
 
     def preload_stocks(self, symbols: list[str]) -> None:
-        """Preload data for multiple stocks"""
-        for symbol in symbols:
-            self.get_stock_data(symbol)
\ No newline at end of file
+        """Preload data for multiple stocks, fetching them concurrently"""
+        if not symbols:
+            return
+        # Loads are I/O bound (CSV cache or yfinance), so threads overlap them
+        with ThreadPoolExecutor(max_workers=min(len(symbols), PRELOAD_WORKERS)) as pool:
+            list(pool.map(self.get_stock_data, symbols))
\ No newline at end of file
@@ -1,5 +1,5 @@
 """Database package"""
-from src.database.connection import init_db, get_session
+from src.database.connection import init_db, get_session, prewarm_pool
 from src.database.models import User, Game, Position
 
-__all__ = ["init_db", "get_session", "User", "Game", "Position"]
\ No newline at end of file
+__all__ = ["init_db", "get_session", "prewarm_pool", "User", "Game", "Position"]
\ No newline at end of file
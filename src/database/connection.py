@@ -1,17 +1,55 @@
 """Database connection management"""
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
-from src.config import DB_PATH
+from src.config import (
+    DB_URL, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_RECYCLE, DB_PREWARM_CONNECTIONS,
+    DB_STATEMENT_CACHE_SIZE, DB_PREPARED_STATEMENT_CACHE_SIZE, SQLITE_CACHE_SIZE_KB, SQLITE_MMAP_SIZE
+)
 
 # Create base for models
 Base = declarative_base()
 
-# Create async engine
+def _engine_options(url: str) -> dict:
+    """Pool and driver options for the configured backend"""
+    options = {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_pre_ping": False,
+        "pool_recycle": DB_POOL_RECYCLE,
+    }
+    if url.startswith("postgresql+asyncpg"):
+        # Native prepared-statement caching on each pooled connection
+        options["connect_args"] = {
+            "statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": DB_PREPARED_STATEMENT_CACHE_SIZE,
+        }
+    return options
+
+# Create async engine (process-wide singleton - one pool shared by all sessions)
 engine = create_async_engine(
-    f"sqlite+aiosqlite:///{DB_PATH}",
+    DB_URL,
     echo=False,  # Set True for debugging
+    **_engine_options(DB_URL),
 )
 
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """Apply per-connection SQLite PRAGMAs"""
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")
+        # WAL + synchronous=NORMAL: commits append to the log without an fsync each time.
+        # A crash can lose the last commits but never corrupts the database.
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+        cursor.close()
+
 # Session factory
 AsyncSessionLocal = async_sessionmaker(
     engine,
@@ -25,8 +63,27 @@ async def init_db():
 
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        # create_all skips tables that already exist, indexes included - add any an older database lacks
+        await conn.run_sync(_create_missing_indexes)
+
+def _create_missing_indexes(sync_conn) -> None:
+    """CREATE INDEX for every model index not yet in the database (CREATE INDEX IF NOT EXISTS)"""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(sync_conn, checkfirst=True)
+
+async def prewarm_pool(connections: int = DB_PREWARM_CONNECTIONS) -> None:
+    """Open pooled connections concurrently so later queries never pay connect latency"""
+    async def _warm():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    # Held concurrently, so each one is a distinct connection returned to the pool
+    connections = min(connections, DB_POOL_SIZE + DB_MAX_OVERFLOW)
+    await asyncio.gather(*(_warm() for _ in range(connections)))
 
-async def get_session() -> AsyncSession:
-    """Get database session"""
+@asynccontextmanager
+async def get_session() -> AsyncIterator[AsyncSession]:
+    """Open a database session: `async with get_session() as session:`"""
     async with AsyncSessionLocal() as session:
-        yield session
\ No newline at end of file
+        yield session
@@ -1,14 +1,38 @@
 """Data Access Objects for database operations"""
-from sqlalchemy import select, delete
+import sys
+from sqlalchemy import select, delete, update, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
-from typing import List, Optional, Union
+from sqlalchemy.dialects import postgresql, sqlite
+from typing import List, Optional, Tuple, Union
 from datetime import datetime
 from src.database.models import User, Game, Position, Transaction
 from src.models import GameState, Portfolio, Position as PositionModel
 from src.models.transaction_models import EnhancedPosition, PositionTransaction
 from src.utils.xirr_calculator import TransactionType
 
+def _transaction_row(game_id: int, symbol: str, trans: PositionTransaction) -> dict:
+    """Build a transactions-table row from a PositionTransaction"""
+    trans_date = trans.date
+    if not isinstance(trans_date, datetime):
+        # It's a date, convert to datetime
+        trans_date = datetime(trans_date.year, trans_date.month, trans_date.day)
+    return {
+        "game_id": game_id,
+        "symbol": symbol,
+        "quantity": trans.quantity,
+        "price": trans.price,
+        "transaction_type": trans.transaction_type.value,
+        "transaction_date": trans_date,
+        "commission": trans.commission,
+    }
+
+# Dialect-specific INSERT constructs that support ON CONFLICT ... DO UPDATE
+_UPSERT_INSERTS = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+
 class GameDAO:
     """Data Access Object for Game operations"""
 
@@ -74,22 +98,31 @@ class GameDAO:
         portfolio: Portfolio,
         current_day: int
     ) -> None:
-        """Save complete game state: cash, realized_pnl, positions, and transactions"""
-        # Update game state
-        result = await session.execute(
-            select(Game).where(Game.id == game_id)
-        )
-        game = result.scalar_one()
-        game.current_cash = portfolio.cash
-        game.current_day = current_day
-        game.realized_pnl = portfolio.realized_pnl
-        await session.commit()
+        """Save complete game state: cash, realized_pnl, positions, and transactions
+
+        All three writes share one transaction, so the save costs a single
+        commit (and a single fsync) instead of one per table.
+        """
+        try:
+            # Update game state
+            result = await session.execute(
+                select(Game).where(Game.id == game_id)
+            )
+            game = result.scalar_one()
+            game.current_cash = portfolio.cash
+            game.current_day = current_day
+            game.realized_pnl = portfolio.realized_pnl
+
+            # Save positions
+            await GameDAO.save_positions(session, game_id, portfolio.positions, commit=False)
 
-        # Save positions
-        await GameDAO.save_positions(session, game_id, portfolio.positions)
+            # Save transactions
+            await GameDAO.save_transactions(session, game_id, portfolio.positions, commit=False)
 
-        # Save transactions
-        await GameDAO.save_transactions(session, game_id, portfolio.positions)
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            raise e
 
     @staticmethod
     async def save_game_state(
@@ -97,58 +130,69 @@ class GameDAO:
         game_id: int,
         cash: float,
         current_day: int,
-        realized_pnl: float = 0.0
+        realized_pnl: float = 0.0,
+        commit: bool = True
     ) -> None:
-        """Update game state including realized P&L (legacy method - prefer save_full_game_state)"""
-        result = await session.execute(
-            select(Game).where(Game.id == game_id)
+        """Update game state including realized P&L (legacy method - prefer save_full_game_state)
+
+        Pass commit=False to leave the changes pending in the caller's transaction.
+        """
+        # Single UPDATE by primary key - no need to load the Game row first
+        await session.execute(
+            update(Game)
+            .where(Game.id == game_id)
+            .values(current_cash=cash, current_day=current_day, realized_pnl=realized_pnl)
         )
-        game = result.scalar_one()
-        game.current_cash = cash
-        game.current_day = current_day
-        game.realized_pnl = realized_pnl
-        await session.commit()
+        if commit:
+            await session.commit()
 
     @staticmethod
     async def save_positions(
         session: AsyncSession,
         game_id: int,
-        positions: List[PositionModel]
+        positions: List[PositionModel],
+        commit: bool = True
     ) -> None:
-        """Save portfolio positions - UPDATE/INSERT/DELETE pattern"""
+        """Save portfolio positions - one upsert plus one delete of sold-out symbols
+
+        Pass commit=False to leave the changes pending in the caller's transaction.
+        """
+
+        # Step 1: Upsert every position in a single INSERT ... ON CONFLICT DO UPDATE
+        rows = [
+            {
+                "game_id": game_id,
+                "symbol": pos.symbol,
+                "quantity": pos.quantity,
+                "avg_buy_price": pos.avg_buy_price,
+                "current_price": pos.current_price
+            }
+            for pos in positions
+        ]
+        if rows:
+            stmt = _UPSERT_INSERTS[session.bind.dialect.name](Position)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Position.game_id, Position.symbol],
+                set_={
+                    "quantity": stmt.excluded.quantity,
+                    "avg_buy_price": stmt.excluded.avg_buy_price,
+                    "current_price": stmt.excluded.current_price
+                }
+            )
+            await session.execute(stmt, rows)
 
-        # Step 1: Get existing positions from database
-        result = await session.execute(
-            select(Position).where(Position.game_id == game_id)
+        # Step 2: Delete positions that no longer exist (sold all shares) in one statement
+        await session.execute(
+            delete(Position).where(
+                Position.game_id == game_id,
+                Position.symbol.not_in([row["symbol"] for row in rows])
+            )
         )
-        existing_positions = {pos.symbol: pos for pos in result.scalars().all()}
-
-        # Step 2: Update existing or insert new positions
-        for pos in positions:
-            if pos.symbol in existing_positions:
-                # UPDATE existing position (no constraint violation)
-                db_pos = existing_positions[pos.symbol]
-                db_pos.quantity = pos.quantity
-                db_pos.avg_buy_price = pos.avg_buy_price
-                db_pos.current_price = pos.current_price
-                # Mark as processed
-                del existing_positions[pos.symbol]
-            else:
-                # INSERT new position
-                db_pos = Position(
-                    game_id=game_id,
-                    symbol=pos.symbol,
-                    quantity=pos.quantity,
-                    avg_buy_price=pos.avg_buy_price,
-                    current_price=pos.current_price
-                )
-                session.add(db_pos)
-
-        # Step 3: Delete positions that no longer exist (sold all shares)
-        for symbol, db_pos in existing_positions.items():
-            await session.delete(db_pos)
 
-        # Step 4: Commit all changes
+        # Step 3: Commit all changes
+        if not commit:
+            await session.flush()
+            return
         try:
             await session.commit()
         except Exception as e:
@@ -159,43 +203,34 @@ class GameDAO:
     async def save_transactions(
         session: AsyncSession,
         game_id: int,
-        positions: List[Union[PositionModel, EnhancedPosition]]
+        positions: List[Union[PositionModel, EnhancedPosition]],
+        commit: bool = True
     ) -> None:
-        """Save transaction history for all positions"""
+        """Save transaction history for all positions
+
+        Pass commit=False to leave the changes pending in the caller's transaction.
+        """
 
         # Step 1: Delete existing transactions for this game
         await session.execute(
             delete(Transaction).where(Transaction.game_id == game_id)
         )
 
-        # Step 2: Insert all transactions from EnhancedPosition objects
-        for pos in positions:
+        # Step 2: Insert all transactions from EnhancedPosition objects in one executemany
+        rows = [
+            _transaction_row(game_id, pos.symbol, trans)
+            for pos in positions
             # Only EnhancedPosition has transactions
-            if hasattr(pos, 'transactions') and hasattr(pos, 'symbol'):
-                for trans in pos.transactions:
-                    # Convert transaction_type enum to string
-                    trans_type = trans.transaction_type.value if hasattr(trans.transaction_type, 'value') else str(trans.transaction_type)
-
-                    # Convert date to datetime if needed
-                    if hasattr(trans.date, 'date'):
-                        # It's already a datetime
-                        trans_date = trans.date
-                    else:
-                        # It's a date, convert to datetime
-                        trans_date = datetime.combine(trans.date, datetime.min.time())
-
-                    db_trans = Transaction(
-                        game_id=game_id,
-                        symbol=pos.symbol,
-                        quantity=trans.quantity,
-                        price=trans.price,
-                        transaction_type=trans_type,
-                        transaction_date=trans_date,
-                        commission=trans.commission if hasattr(trans, 'commission') else 0.0
-                    )
-                    session.add(db_trans)
+            if isinstance(pos, EnhancedPosition)
+            for trans in pos.transactions
+        ]
+        if rows:
+            await session.execute(insert(Transaction), rows)
 
         # Step 3: Commit all transactions
+        if not commit:
+            await session.flush()
+            return
         try:
             await session.commit()
         except Exception as e:
@@ -207,10 +242,12 @@ class GameDAO:
         """Convert DB Game to GameState model with transaction history"""
 
         # Group transactions by symbol
+        # Rows loaded from the DB bypass the model validators, so intern here
         transactions_by_symbol = {}
         for db_trans in game.transactions:
-            if db_trans.symbol not in transactions_by_symbol:
-                transactions_by_symbol[db_trans.symbol] = []
+            symbol = sys.intern(db_trans.symbol)
+            if symbol not in transactions_by_symbol:
+                transactions_by_symbol[symbol] = []
 
             # Convert DB transaction to PositionTransaction
             trans_type = TransactionType.BUY if db_trans.transaction_type == "BUY" else TransactionType.SELL
@@ -223,26 +260,31 @@ class GameDAO:
                 transaction_type=trans_type,
                 commission=db_trans.commission
             )
-            transactions_by_symbol[db_trans.symbol].append(pos_trans)
+            transactions_by_symbol[symbol].append(pos_trans)
+
+        # Replay each symbol's history in chronological order
+        for symbol_transactions in transactions_by_symbol.values():
+            symbol_transactions.sort(key=lambda t: t.date)
 
         # Build positions with transaction history
         positions = []
         for pos in game.positions:
+            symbol = sys.intern(pos.symbol)
             # Get current price from DB position or use avg_buy_price as fallback
             current_price = pos.current_price or pos.avg_buy_price
 
             # If we have transaction history for this symbol, create EnhancedPosition
-            if pos.symbol in transactions_by_symbol:
+            if symbol in transactions_by_symbol:
                 enhanced_pos = EnhancedPosition(
-                    symbol=pos.symbol,
+                    symbol=symbol,
                     current_price=current_price,
-                    transactions=transactions_by_symbol[pos.symbol]
+                    transactions=transactions_by_symbol[symbol]
                 )
                 positions.append(enhanced_pos)
             else:
                 # Fallback to legacy Position if no transaction history
                 legacy_pos = PositionModel(
-                    symbol=pos.symbol,
+                    symbol=symbol,
                     quantity=pos.quantity,
                     avg_buy_price=pos.avg_buy_price,
                     current_price=current_price
@@ -254,6 +296,9 @@ class GameDAO:
             positions=positions,
             realized_pnl=game.realized_pnl if hasattr(game, 'realized_pnl') else 0.0
         )
+        # Upgrade history-less rows once here so trades never hit the legacy path.
+        # Best available purchase date for them is the game start.
+        portfolio.upgrade_legacy_positions(game.created_at.date())
 
         game_state = GameState(
             player_name=user.full_name or user.username,
@@ -266,13 +311,13 @@ class GameDAO:
 
         # Initialize portfolio_history with current state
         # (Full history is not persisted, so we start with current snapshot)
-        game_state.portfolio_history = [{
+        game_state.portfolio_history.append({
             "day": game.current_day,
             "total_value": portfolio.total_value,
             "cash": portfolio.cash,
             "positions_value": portfolio.positions_value,
             "pnl": portfolio.total_pnl
-        }]
+        })
 
         return game_state
 
@@ -308,6 +353,27 @@ class UserDAO:
         )
         return result.scalar_one_or_none()
 
+    @staticmethod
+    async def get_user_and_latest_game(
+        session: AsyncSession,
+        username: str,
+        full_name: str = None
+    ) -> Tuple[User, Optional[Game]]:
+        """Get (or create) a user together with their most recent game in one joined query"""
+        result = await session.execute(
+            select(User, Game)
+            .outerjoin(Game, Game.user_id == User.id)
+            .options(selectinload(Game.positions))
+            .options(selectinload(Game.transactions))
+            .where(User.username == username)
+            .order_by(Game.created_at.desc())
+            .limit(1)
+        )
+        row = result.first()
+        if row is None:
+            return await UserDAO.create_user(session, username, full_name), None
+        return row.User, row.Game
+
     @staticmethod
     async def get_or_create_user(
         session: AsyncSession,
@@ -1,7 +1,8 @@
 """SQLAlchemy database models"""
+import sys
 from datetime import datetime
-from sqlalchemy import String, Integer, Float, ForeignKey, DateTime, UniqueConstraint
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import String, Integer, Float, ForeignKey, DateTime, UniqueConstraint, Index
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 from typing import List, Optional
 from src.database.connection import Base
 
@@ -47,7 +48,10 @@ class Game(Base):
 class Position(Base):
     """Position model"""
     __tablename__ = "positions"
-    __table_args__ = (UniqueConstraint('game_id', 'symbol', name='uq_game_symbol'),)
+    __table_args__ = (
+        UniqueConstraint('game_id', 'symbol', name='uq_game_symbol'),
+        Index('ix_positions_game_id', 'game_id'),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     game_id: Mapped[int] = mapped_column(Integer, ForeignKey("games.id"), nullable=False)
@@ -59,12 +63,18 @@ class Position(Base):
     # Relationships
     game: Mapped["Game"] = relationship("Game", back_populates="positions")
 
+    @validates("symbol")
+    def _intern_symbol(self, key, value):
+        """Intern symbols so dict lookups keyed on them compare by identity"""
+        return sys.intern(value)
+
     def __repr__(self):
         return f"<Position(symbol='{self.symbol}', qty={self.quantity})>"
 
 class Transaction(Base):
     """Transaction model for tracking individual buy/sell transactions"""
     __tablename__ = "transactions"
+    __table_args__ = (Index('ix_transactions_game_id_date', 'game_id', 'transaction_date'),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     game_id: Mapped[int] = mapped_column(Integer, ForeignKey("games.id"), nullable=False)
@@ -79,5 +89,10 @@ class Transaction(Base):
     # Relationships
     game: Mapped["Game"] = relationship("Game", back_populates="transactions")
 
+    @validates("symbol")
+    def _intern_symbol(self, key, value):
+        """Intern symbols so dict lookups keyed on them compare by identity"""
+        return sys.intern(value)
+
     def __repr__(self):
         return f"<Transaction({self.transaction_type} {self.quantity} {self.symbol} @ ₹{self.price})>"
\ No newline at end of file
@@ -1,4 +1,4 @@
 """Game engine package"""
-from src.engine.trade_executor import TradeExecutor
+from src.engine.trade_executor import CostBreakdown, TradeExecutor, set_simulation_date
 
-__all__ = ["TradeExecutor"]
\ No newline at end of file
+__all__ = ["CostBreakdown", "TradeExecutor", "set_simulation_date"]
\ No newline at end of file
@@ -0,0 +1,63 @@
+"""Transaction-cost kernels: scalar (JIT-compiled with Numba when installed) and NumPy batch"""
+import numpy as np
+from src.config import (
+    BROKERAGE_RATE, STT_RATE_BUY, STT_RATE_SELL,
+    EXCHANGE_CHARGES_RATE, GST_RATE, SEBI_FEES_RATE
+)
+from src.utils.performance import njit
+
+# Combined per-rupee cost rates, precomputed once. GST applies to brokerage + exchange charges.
+BROKERAGE_CAP = 20.0  # Flat ₹20 maximum brokerage per order
+_GST_MULTIPLIER = 1 + GST_RATE
+_BROKERAGE_CAP_TRADE_VALUE = BROKERAGE_CAP / BROKERAGE_RATE  # Above this, brokerage is flat
+# Below the brokerage cap: every component scales with trade value
+_BUY_RATE_UNCAPPED = (BROKERAGE_RATE + EXCHANGE_CHARGES_RATE) * _GST_MULTIPLIER + STT_RATE_BUY + SEBI_FEES_RATE
+_SELL_RATE_UNCAPPED = (BROKERAGE_RATE + EXCHANGE_CHARGES_RATE) * _GST_MULTIPLIER + STT_RATE_SELL + SEBI_FEES_RATE
+# Above the cap: brokerage (+ its GST) is a fixed amount, the rest scales
+_BUY_RATE_CAPPED = EXCHANGE_CHARGES_RATE * _GST_MULTIPLIER + STT_RATE_BUY + SEBI_FEES_RATE
+_SELL_RATE_CAPPED = EXCHANGE_CHARGES_RATE * _GST_MULTIPLIER + STT_RATE_SELL + SEBI_FEES_RATE
+_CAPPED_BROKERAGE_WITH_GST = BROKERAGE_CAP * _GST_MULTIPLIER
+
+@njit(cache=True)
+def compute_costs(trade_value: float, is_buy: bool) -> tuple:
+    """
+    Calculate transaction costs for one trade
+
+    Returns: (total, brokerage, stt, exchange_charges, gst, sebi_fees)
+    """
+    # Total from the combined rates: one multiply below the brokerage cap
+    if trade_value <= _BROKERAGE_CAP_TRADE_VALUE:
+        brokerage = trade_value * BROKERAGE_RATE
+        total = trade_value * (_BUY_RATE_UNCAPPED if is_buy else _SELL_RATE_UNCAPPED)
+    else:
+        brokerage = BROKERAGE_CAP
+        total = trade_value * (_BUY_RATE_CAPPED if is_buy else _SELL_RATE_CAPPED) + _CAPPED_BROKERAGE_WITH_GST
+
+    # Individual components, for the breakdown
+    stt = trade_value * (STT_RATE_BUY if is_buy else STT_RATE_SELL)
+    exchange_charges = trade_value * EXCHANGE_CHARGES_RATE
+    sebi_fees = trade_value * SEBI_FEES_RATE
+    gst = (brokerage + exchange_charges) * GST_RATE
+
+    return total, brokerage, stt, exchange_charges, gst, sebi_fees
+
+def compute_costs_batch(trade_values: np.ndarray, is_buy: np.ndarray) -> tuple:
+    """
+    Vectorized compute_costs over arrays of trade values and buy/sell flags
+
+    Returns: (total, brokerage, stt, exchange_charges, gst, sebi_fees) as float64 arrays
+    """
+    uncapped = trade_values <= _BROKERAGE_CAP_TRADE_VALUE
+    brokerage = np.where(uncapped, trade_values * BROKERAGE_RATE, BROKERAGE_CAP)
+    total = np.where(
+        uncapped,
+        trade_values * np.where(is_buy, _BUY_RATE_UNCAPPED, _SELL_RATE_UNCAPPED),
+        trade_values * np.where(is_buy, _BUY_RATE_CAPPED, _SELL_RATE_CAPPED) + _CAPPED_BROKERAGE_WITH_GST
+    )
+
+    stt = trade_values * np.where(is_buy, STT_RATE_BUY, STT_RATE_SELL)
+    exchange_charges = trade_values * EXCHANGE_CHARGES_RATE
+    sebi_fees = trade_values * SEBI_FEES_RATE
+    gst = (brokerage + exchange_charges) * GST_RATE
+
+    return total, brokerage, stt, exchange_charges, gst, sebi_fees
@@ -1,31 +1,75 @@
 """Trade execution logic"""
-from dataclasses import dataclass
+import sys
+from dataclasses import dataclass, field
+from functools import lru_cache
 from enum import Enum
 from datetime import datetime, date
+from typing import List, NamedTuple, Optional
+import numpy as np
 from src.models import Portfolio, Position
 from src.config import COMMISSION_RATE
+from src.engine._costs import BROKERAGE_CAP, compute_costs, compute_costs_batch
 from src.utils.xirr_calculator import TransactionType
 from src.models.transaction_models import EnhancedPosition, PositionTransaction
 
 # Reuse TransactionType as OrderSide for compatibility
 OrderSide = TransactionType
 
-@dataclass
+# Simulation clock, pushed once per trading day. None falls back to the wall clock.
+_current_sim_date: Optional[date] = None
+
+def set_simulation_date(sim_date: Optional[date]) -> None:
+    """Set the date used for trades executed without an explicit transaction_date"""
+    global _current_sim_date
+    _current_sim_date = sim_date
+
+class CostBreakdown(NamedTuple):
+    """Per-component transaction costs of one trade, unrounded - round only for display"""
+    brokerage: float
+    stt: float
+    exchange_charges: float
+    gst: float
+    sebi_fees: float
+    total: float
+
+@lru_cache(maxsize=65536)
+def _compute_costs(trade_value_paise: int, is_buy: bool) -> tuple[float, CostBreakdown]:
+    """Pure cost computation keyed on the trade value in paise, so repeat trades hit the cache"""
+    total, brokerage, stt, exchange_charges, gst, sebi_fees = compute_costs(trade_value_paise / 100, is_buy)
+
+    # Breakdown for transparency (immutable, so cached instances are safe to share)
+    breakdown = CostBreakdown(brokerage, stt, exchange_charges, gst, sebi_fees, total)
+
+    return total, breakdown
+
+def _validation_error(symbol: str, quantity: int, price: float) -> Optional[str]:
+    """Return why the trade inputs are invalid, or None - one chained check on the common valid path"""
+    if symbol and 0 < quantity <= 10000 and 0 < price <= 100000:
+        return None
+    valid, message = TradeExecutor.validate_trade_inputs(symbol, quantity, price)
+    return None if valid else message
+
+@dataclass(slots=True)
 class TradeResult:
     """Result of trade execution"""
     success: bool
-    message: str
+    message_template: str  # str.format template, rendered with message_args on first read of .message
     executed_price: float = 0.0
     quantity: int = 0
     total_cost: float = 0.0
     commission: float = 0.0
     realized_pnl: float = 0.0  # Realized P&L (only for sell orders)
-    cost_breakdown: dict = None  # Detailed cost breakdown for transparency
-
-    def __post_init__(self):
-        """Initialize cost_breakdown as empty dict if None"""
-        if self.cost_breakdown is None:
-            self.cost_breakdown = {}
+    cost_breakdown: Optional[CostBreakdown] = None  # Detailed cost breakdown for transparency
+    message_args: tuple = ()
+    _message: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def message(self) -> str:
+        """Human-readable outcome, formatted lazily since back-tests rarely read it"""
+        if self._message is None:
+            args = self.message_args
+            self._message = self.message_template.format(*args) if args else self.message_template
+        return self._message
 
 class TradeExecutor:
     """Executes buy/sell orders"""
@@ -58,17 +102,17 @@ class TradeExecutor:
     def calculate_commission(amount: float) -> float:
         """Calculate commission (0.03% or ₹20 max) - LEGACY METHOD"""
         commission = amount * COMMISSION_RATE
-        return min(commission, 20.0)
+        return min(commission, BROKERAGE_CAP)
 
     @staticmethod
     def calculate_all_costs(
         trade_value: float,
         is_buy: bool = True
-    ) -> tuple[float, dict]:
+    ) -> tuple[float, CostBreakdown]:
         """
         Calculate ALL transaction costs for Indian stock markets
 
-        Returns: (total_cost, cost_breakdown_dict)
+        Returns: (total_cost, CostBreakdown)
 
         Includes:
         - Brokerage (0.03%)
@@ -77,43 +121,7 @@ class TradeExecutor:
         - GST (18% on brokerage + exchange)
         - SEBI fees (₹10 per crore)
         """
-        from src.config import (
-            BROKERAGE_RATE, STT_RATE_BUY, STT_RATE_SELL,
-            EXCHANGE_CHARGES_RATE, GST_RATE, SEBI_FEES_RATE
-        )
-
-        # 1. Brokerage
-        brokerage = trade_value * BROKERAGE_RATE
-        brokerage = min(brokerage, 20.0)  # Cap at ₹20
-
-        # 2. STT (Securities Transaction Tax)
-        stt_rate = STT_RATE_BUY if is_buy else STT_RATE_SELL
-        stt = trade_value * stt_rate
-
-        # 3. Exchange transaction charges
-        exchange_charges = trade_value * EXCHANGE_CHARGES_RATE
-
-        # 4. SEBI fees
-        sebi_fees = trade_value * SEBI_FEES_RATE
-
-        # 5. GST (on brokerage + exchange charges)
-        taxable_amount = brokerage + exchange_charges
-        gst = taxable_amount * GST_RATE
-
-        # Total
-        total = brokerage + stt + exchange_charges + sebi_fees + gst
-
-        # Breakdown for transparency
-        breakdown = {
-            'brokerage': round(brokerage, 2),
-            'stt': round(stt, 2),
-            'exchange_charges': round(exchange_charges, 2),
-            'gst': round(gst, 2),
-            'sebi_fees': round(sebi_fees, 2),
-            'total': round(total, 2)
-        }
-
-        return total, breakdown
+        return _compute_costs(round(trade_value * 100), is_buy)
 
     @staticmethod
     def execute_buy(
@@ -125,24 +133,41 @@ class TradeExecutor:
     ) -> TradeResult:
         """Execute buy order with transaction tracking"""
         # Validate inputs first
-        valid, message = TradeExecutor.validate_trade_inputs(symbol, quantity, price)
-        if not valid:
-            return TradeResult(success=False, message=message)
+        error = _validation_error(symbol, quantity, price)
+        if error is not None:
+            return TradeResult(success=False, message_template=error)
+        symbol = sys.intern(symbol)  # Identity-fast compares and dict probes downstream
 
-        # Use provided transaction date or default to current date
+        # Use provided transaction date, else the simulation date, else the current date
         if transaction_date is None:
-            transaction_date = datetime.now().date()
+            transaction_date = _current_sim_date or datetime.now().date()
 
         # Calculate all costs (brokerage, STT, exchange, GST, SEBI)
-        trade_value = price * quantity
-        commission, cost_breakdown = TradeExecutor.calculate_all_costs(trade_value, is_buy=True)
-        total_cost = trade_value + commission
+        commission, cost_breakdown = TradeExecutor.calculate_all_costs(price * quantity, is_buy=True)
+
+        return TradeExecutor._apply_buy(
+            portfolio, symbol, quantity, price, transaction_date, commission, cost_breakdown
+        )
+
+    @staticmethod
+    def _apply_buy(
+        portfolio: Portfolio,
+        symbol: str,
+        quantity: int,
+        price: float,
+        transaction_date: date,
+        commission: float,
+        cost_breakdown: CostBreakdown
+    ) -> TradeResult:
+        """Apply a validated buy with precomputed costs to the portfolio"""
+        total_cost = price * quantity + commission
 
         # Check if enough cash
         if portfolio.cash < total_cost:
             return TradeResult(
                 success=False,
-                message=f"Insufficient funds. Need ₹{total_cost:,.2f}, have ₹{portfolio.cash:,.2f}",
+                message_template="Insufficient funds. Need ₹{:,.2f}, have ₹{:,.2f}",
+                message_args=(total_cost, portfolio.cash),
                 cost_breakdown=cost_breakdown
             )
 
@@ -150,13 +175,7 @@ class TradeExecutor:
         portfolio.cash -= total_cost
 
         # Find existing position (either legacy Position or EnhancedPosition)
-        existing_pos = None
-        pos_idx = -1
-        for i, pos in enumerate(portfolio.positions):
-            if hasattr(pos, 'symbol') and pos.symbol == symbol:
-                existing_pos = pos
-                pos_idx = i
-                break
+        pos_idx, existing_pos = portfolio.find_position(symbol)
 
         # Create transaction record
         transaction = PositionTransaction(
@@ -167,38 +186,14 @@ class TradeExecutor:
             commission=commission  # Include ALL transaction costs
         )
 
-        if existing_pos:
-            # Check if existing position supports transactions
-            if hasattr(existing_pos, 'add_transaction'):
-                # Add transaction to existing enhanced position
-                existing_pos.add_transaction(transaction)
-                existing_pos.current_price = price  # Update current price
-            else:
-                # Handle legacy Position model - convert to EnhancedPosition
-                # WARNING: We cannot accurately determine the original purchase date from legacy Position
-                # This will result in incorrect XIRR calculations. The proper fix is to store
-                # transaction history in the database.
-                enhanced_pos = EnhancedPosition(
-                    symbol=symbol,
-                    current_price=price,
-                )
-
-                # Create a transaction representing the existing holdings
-                # NOTE: Using current transaction date as fallback since we don't have historical data
-                # This is a known limitation of the legacy Position model
-                existing_transaction = PositionTransaction(
-                    date=transaction_date,  # LIMITATION: Unknown actual purchase date
-                    quantity=existing_pos.quantity,
-                    price=existing_pos.avg_buy_price,
-                    transaction_type=OrderSide.BUY
-                )
-                enhanced_pos.add_transaction(existing_transaction)
-
-                # Then add the new transaction
-                enhanced_pos.add_transaction(transaction)
-
-                # Replace the legacy position with the enhanced one
-                portfolio.positions[pos_idx] = enhanced_pos
+        if existing_pos is not None:
+            if not isinstance(existing_pos, EnhancedPosition):
+                # One-time upgrade of a legacy Position. WARNING: the original purchase date is
+                # unknown, so the trade date is used (XIRR for those shares will be approximate)
+                existing_pos = portfolio.upgrade_position(pos_idx, transaction_date)
+            # Add transaction to existing enhanced position
+            existing_pos.add_transaction(transaction)
+            existing_pos.current_price = price  # Update current price
         else:
             # Create new enhanced position with first transaction
             new_pos = EnhancedPosition(
@@ -206,11 +201,12 @@ class TradeExecutor:
                 current_price=price,
             )
             new_pos.add_transaction(transaction)
-            portfolio.positions.append(new_pos)
+            portfolio.add_position(new_pos)
 
         return TradeResult(
             success=True,
-            message=f"Bought {quantity} shares of {symbol} at ₹{price:,.2f}",
+            message_template="Bought {} shares of {} at ₹{:,.2f}",
+            message_args=(quantity, symbol, price),
             executed_price=price,
             quantity=quantity,
             total_cost=total_cost,
@@ -228,50 +224,54 @@ class TradeExecutor:
     ) -> TradeResult:
         """Execute sell order with transaction tracking"""
         # Validate inputs first
-        valid, message = TradeExecutor.validate_trade_inputs(symbol, quantity, price)
-        if not valid:
-            return TradeResult(success=False, message=message)
+        error = _validation_error(symbol, quantity, price)
+        if error is not None:
+            return TradeResult(success=False, message_template=error)
+        symbol = sys.intern(symbol)  # Identity-fast compares and dict probes downstream
 
-        # Use provided transaction date or default to current date
+        # Use provided transaction date, else the simulation date, else the current date
         if transaction_date is None:
-            transaction_date = datetime.now().date()
+            transaction_date = _current_sim_date or datetime.now().date()
 
+        # Calculate all costs (includes STT on sell which is the biggest cost)
+        commission, cost_breakdown = TradeExecutor.calculate_all_costs(price * quantity, is_buy=False)
+
+        return TradeExecutor._apply_sell(
+            portfolio, symbol, quantity, price, transaction_date, commission, cost_breakdown
+        )
+
+    @staticmethod
+    def _apply_sell(
+        portfolio: Portfolio,
+        symbol: str,
+        quantity: int,
+        price: float,
+        transaction_date: date,
+        commission: float,
+        cost_breakdown: CostBreakdown
+    ) -> TradeResult:
+        """Apply a validated sell with precomputed costs to the portfolio"""
         # Find position
-        position = None
-        pos_idx = -1
-        for i, pos in enumerate(portfolio.positions):
-            if hasattr(pos, 'symbol') and pos.symbol == symbol:
-                position = pos
-                pos_idx = i
-                break
+        pos_idx, position = portfolio.find_position(symbol)
 
         if not position:
             return TradeResult(
                 success=False,
-                message=f"No position in {symbol}"
+                message_template="No position in {}",
+                message_args=(symbol,)
             )
 
-        # Check quantity based on position type
-        if hasattr(position, 'quantity'):
-            if hasattr(position, 'add_transaction'):
-                # EnhancedPosition - use its quantity property
-                available_quantity = position.quantity
-            else:
-                # Legacy Position model
-                available_quantity = position.quantity
-        else:
-            # Fallback for old position model
-            available_quantity = position.quantity if hasattr(position, 'quantity') else 0
+        # Both Position and EnhancedPosition expose quantity
+        available_quantity = position.quantity
 
         if available_quantity < quantity:
             return TradeResult(
                 success=False,
-                message=f"Insufficient quantity. Have {available_quantity}, trying to sell {quantity}"
+                message_template="Insufficient quantity. Have {}, trying to sell {}",
+                message_args=(available_quantity, quantity)
             )
 
-        # Calculate all costs (includes STT on sell which is the biggest cost)
         trade_value = price * quantity
-        commission, cost_breakdown = TradeExecutor.calculate_all_costs(trade_value, is_buy=False)
         net_proceeds = trade_value - commission
 
         # Create transaction record
@@ -283,59 +283,23 @@ class TradeExecutor:
             commission=commission  # Include ALL transaction costs
         )
 
-        if hasattr(position, 'add_transaction'):
-            # Add transaction to enhanced position
-            position.add_transaction(transaction)
-            if position.quantity == 0:
-                # Remove position if all shares sold
-                portfolio.positions.pop(pos_idx)
-            else:
-                position.current_price = price
+        if not isinstance(position, EnhancedPosition):
+            # One-time upgrade of a legacy Position. WARNING: the original purchase date is
+            # unknown, so the trade date is used (XIRR for those shares will be approximate)
+            position = portfolio.upgrade_position(pos_idx, transaction_date)
+
+        # Add transaction to enhanced position
+        position.add_transaction(transaction)
+        if position.quantity == 0:
+            # Remove position if all shares sold
+            portfolio.remove_position(pos_idx)
         else:
-            # Handle legacy Position model by converting to EnhancedPosition first
-            if hasattr(position, 'quantity'):
-                # Convert legacy position to enhanced position (if it's not already)
-                # WARNING: We cannot accurately determine the original purchase date from legacy Position
-                enhanced_pos = EnhancedPosition(
-                    symbol=symbol,
-                    current_price=price,
-                )
-
-                # Create a transaction representing the existing holdings
-                # NOTE: Using current transaction date as fallback since we don't have historical data
-                existing_transaction = PositionTransaction(
-                    date=transaction_date,  # LIMITATION: Unknown actual purchase date
-                    quantity=position.quantity,
-                    price=position.avg_buy_price,
-                    transaction_type=OrderSide.BUY
-                )
-                enhanced_pos.add_transaction(existing_transaction)
-
-                # Add the sell transaction
-                enhanced_pos.add_transaction(transaction)
-
-                # Replace the legacy position with the enhanced one
-                portfolio.positions[pos_idx] = enhanced_pos
-
-                # If quantity becomes 0, remove the position
-                if enhanced_pos.quantity == 0:
-                    portfolio.positions.pop(pos_idx)
-            else:
-                # Fallback for basic position - use legacy approach
-                position.quantity -= quantity
-                if position.quantity == 0:
-                    portfolio.positions.pop(pos_idx)
-                else:
-                    position.current_price = price
+            position.current_price = price
 
         # Calculate realized P&L
         # Cost basis of sold shares = avg_buy_price * quantity
         # (avg_buy_price already includes commission in cost basis calculation)
-        if hasattr(position, 'avg_buy_price'):
-            cost_basis_sold = position.avg_buy_price * quantity
-        else:
-            # Fallback for legacy positions (shouldn't happen)
-            cost_basis_sold = 0
+        cost_basis_sold = position.avg_buy_price * quantity
 
         realized_pnl = trade_value - commission - cost_basis_sold
 
@@ -347,11 +311,67 @@ class TradeExecutor:
 
         return TradeResult(
             success=True,
-            message=f"Sold {quantity} shares of {symbol} at ₹{price:,.2f}",
+            message_template="Sold {} shares of {} at ₹{:,.2f}",
+            message_args=(quantity, symbol, price),
             executed_price=price,
             quantity=quantity,
             total_cost=net_proceeds,
             commission=commission,
             realized_pnl=realized_pnl,
             cost_breakdown=cost_breakdown
-        )
\ No newline at end of file
+        )
+
+    @staticmethod
+    def execute_batch(
+        portfolio: Portfolio,
+        symbols: np.ndarray,
+        quantities: np.ndarray,
+        prices: np.ndarray,
+        is_buy: np.ndarray,
+        dates: Optional[np.ndarray] = None
+    ) -> List[TradeResult]:
+        """
+        Execute a sequence of trades (e.g. a back-test replay) in order
+
+        Validation and transaction costs are computed for all trades at once with NumPy;
+        only applying each trade to the portfolio runs per trade, since cash and holdings
+        depend on the trades before it. Results match calling execute_buy/execute_sell in order.
+
+        Args:
+            symbols: Stock symbols
+            quantities: Share counts
+            prices: Execution prices
+            is_buy: True for buys, False for sells
+            dates: datetime64 trade dates (default: simulation date or today)
+        """
+        quantities = np.asarray(quantities, dtype=np.int64)
+        prices = np.asarray(prices, dtype=np.float64)
+        is_buy = np.asarray(is_buy, dtype=bool)
+
+        # One vectorized pass for input validation and costs
+        invalid = (quantities <= 0) | (quantities > 10000) | (prices <= 0) | (prices > 100000)
+        trade_values = np.round(prices * quantities * 100) / 100  # Quantize to paise like calculate_all_costs
+        totals, *components = compute_costs_batch(trade_values, is_buy)
+        breakdowns = np.column_stack((*components, totals)).tolist()
+
+        if dates is None:
+            default_date = _current_sim_date or datetime.now().date()
+            trade_dates = [default_date] * len(quantities)
+        else:
+            trade_dates = np.asarray(dates).astype('datetime64[D]').tolist()
+
+        results = []
+        for i, (symbol, quantity, price, buy) in enumerate(
+            zip(np.asarray(symbols).tolist(), quantities.tolist(), prices.tolist(), is_buy.tolist())
+        ):
+            if invalid[i] or not symbol:
+                results.append(TradeResult(success=False, message_template=_validation_error(symbol, quantity, price)))
+                continue
+
+            apply = TradeExecutor._apply_buy if buy else TradeExecutor._apply_sell
+            results.append(apply(
+                portfolio, sys.intern(symbol), quantity, price, trade_dates[i],
+                float(totals[i]), CostBreakdown._make(breakdowns[i])
+            ))
+
+        return results
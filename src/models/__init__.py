@@ -1,10 +1,15 @@
 """Data models (Pydantic, not SQLAlchemy yet)"""
+import sys
+from collections import deque
 from dataclasses import dataclass, field
-from datetime import datetime
-from typing import List, Union
+from datetime import datetime, date
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+import numpy as np
 from .transaction_models import EnhancedPosition, PositionTransaction
 
-@dataclass
+PORTFOLIO_HISTORY_LIMIT = 300  # Recent days kept for charts and coach memory
+
+@dataclass(slots=True)
 class Position:
     """Single stock position (legacy model for backward compatibility)"""
     symbol: str
@@ -12,6 +17,10 @@ class Position:
     avg_buy_price: float
     current_price: float
 
+    def __post_init__(self):
+        """Intern the symbol so lookups compare by identity"""
+        self.symbol = sys.intern(self.symbol)
+
     @property
     def market_value(self) -> float:
         return self.quantity * self.current_price
@@ -28,16 +37,153 @@ class Position:
     def unrealized_pnl_pct(self) -> float:
         return (self.unrealized_pnl / self.cost_basis) * 100 if self.cost_basis > 0 else 0.0
 
-@dataclass
+class PositionTable(NamedTuple):
+    """Portfolio-wide columns, one entry per position in portfolio order"""
+    symbol: List[str]
+    quantity: np.ndarray
+    avg_buy_price: np.ndarray
+    current_price: np.ndarray
+    market_value: np.ndarray
+    cost_basis: np.ndarray
+    unrealized_pnl: np.ndarray
+    unrealized_pnl_pct: np.ndarray
+
+@dataclass(slots=True)
 class Portfolio:
     """User's portfolio"""
     cash: float
     positions: List[Union[Position, EnhancedPosition]] = field(default_factory=list)
     realized_pnl: float = 0.0  # Cumulative P&L from closed positions
+    _pos_by_symbol: Dict[str, int] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        """Build the symbol -> list index lookup"""
+        self._reindex_positions()
+
+    def _reindex_positions(self, start: int = 0) -> None:
+        """Rebuild symbol -> index entries from position `start` onwards"""
+        if start == 0:
+            self._pos_by_symbol.clear()
+        for i in range(start, len(self.positions)):
+            self._pos_by_symbol[self.positions[i].symbol] = i
+
+    def find_position(self, symbol: str) -> Tuple[int, Optional[Union[Position, EnhancedPosition]]]:
+        """Return (index, position) for symbol, or (-1, None) if not held"""
+        idx = self._pos_by_symbol.get(symbol)
+        positions = self.positions
+        if idx is not None and idx < len(positions) and positions[idx].symbol == symbol:
+            return idx, positions[idx]
+
+        # Missing or stale entry: positions may have been reassigned or mutated directly,
+        # so resync the index once before answering "not held"
+        self._reindex_positions()
+        idx = self._pos_by_symbol.get(symbol)
+        if idx is None:
+            return -1, None
+        return idx, positions[idx]
+
+    def add_position(self, position: Union[Position, EnhancedPosition]) -> None:
+        """Append a position and index it"""
+        self._pos_by_symbol[position.symbol] = len(self.positions)
+        self.positions.append(position)
+
+    def replace_position(self, idx: int, position: Union[Position, EnhancedPosition]) -> None:
+        """Replace the position at idx (same symbol)"""
+        self.positions[idx] = position
+        self._pos_by_symbol[position.symbol] = idx
+
+    def upgrade_position(self, idx: int, purchase_date: Union[datetime, date]) -> EnhancedPosition:
+        """Replace the legacy Position at idx with an equivalent EnhancedPosition"""
+        enhanced_pos = EnhancedPosition.from_legacy(self.positions[idx], purchase_date)
+        self.replace_position(idx, enhanced_pos)
+        return enhanced_pos
+
+    def upgrade_legacy_positions(self, purchase_date: Union[datetime, date]) -> None:
+        """Convert every legacy Position to EnhancedPosition in one pass (e.g. after loading)"""
+        for i, position in enumerate(self.positions):
+            if not isinstance(position, EnhancedPosition):
+                self.upgrade_position(i, purchase_date)
+
+    def remove_position(self, idx: int) -> None:
+        """Remove the position at idx and shift the indices after it"""
+        removed = self.positions.pop(idx)
+        self._pos_by_symbol.pop(removed.symbol, None)
+        self._reindex_positions(idx)
+
+    def update_prices(self, price_map: Dict[str, float]) -> None:
+        """Apply a symbol -> price map through the symbol index (symbols not held are skipped)"""
+        for symbol, price in price_map.items():
+            _, position = self.find_position(symbol)
+            if position is not None:
+                position.current_price = price
+
+    def position_table(self) -> PositionTable:
+        """Gather every position's cached metrics into columns, reading each attribute once"""
+        positions = self.positions
+        n = len(positions)
+
+        def column(attr: str, dtype=np.float64) -> np.ndarray:
+            return np.fromiter((getattr(p, attr) for p in positions), dtype=dtype, count=n)
+
+        cost_basis = column("cost_basis")
+        unrealized_pnl = column("unrealized_pnl")
+        # Percentage of cost basis, 0 where there is no cost basis
+        pnl_pct = np.divide(unrealized_pnl * 100, cost_basis, out=np.zeros(n), where=cost_basis > 0)
+        return PositionTable(
+            symbol=[p.symbol for p in positions],
+            quantity=column("quantity", np.int64),
+            avg_buy_price=column("avg_buy_price"),
+            current_price=column("current_price"),
+            market_value=column("market_value"),
+            cost_basis=cost_basis,
+            unrealized_pnl=unrealized_pnl,
+            unrealized_pnl_pct=pnl_pct,
+        )
+
+    def snapshot(self) -> Tuple[float, float, float]:
+        """Return (positions_value, invested, unrealized_pnl) from a single pass over positions"""
+        positions_value = invested = unrealized = 0.0
+        for p in self.positions:
+            positions_value += p.market_value
+            invested += p.cost_basis
+            unrealized += p.unrealized_pnl
+        return positions_value, invested, unrealized
+
+    def refresh_metrics(self, today: Optional[date] = None) -> Dict[str, float]:
+        """Return symbol -> XIRR for positions with transaction history, all valued at one date
+
+        today defaults to the real date, read once so every position shares the same XIRR cache key.
+        """
+        today = today or datetime.now().date()
+        return {
+            p.symbol: p.calculate_xirr(today)
+            for p in self.positions
+            if isinstance(p, EnhancedPosition)
+        }
+
+    def pending_xirr_inputs(self, today: date) -> List[tuple]:
+        """(position, cache key, cash flows) for enhanced positions whose XIRR memo is stale at today
+
+        Built on the caller's thread; solve the flows with EnhancedPosition.solve_cash_flows
+        anywhere, then hand the results back to store_xirr_results on the caller's thread.
+        """
+        jobs = []
+        for p in self.positions:
+            if isinstance(p, EnhancedPosition):
+                pending = p.xirr_inputs(today)
+                if pending is not None:
+                    jobs.append((p, *pending))
+        return jobs
+
+    @staticmethod
+    def store_xirr_results(jobs: List[tuple], results: List[float]) -> None:
+        """Memoize XIRRs solved for pending_xirr_inputs jobs on their positions"""
+        for (position, key, _), result in zip(jobs, results):
+            position.store_xirr(key, result)
 
     @property
     def positions_value(self) -> float:
-        return sum(self._get_market_value(p) for p in self.positions)
+        return sum(p.market_value for p in self.positions)
 
     @property
     def total_value(self) -> float:
@@ -45,38 +191,16 @@ class Portfolio:
 
     @property
     def invested(self) -> float:
-        return sum(self._get_cost_basis(p) for p in self.positions)
+        return sum(p.cost_basis for p in self.positions)
 
     @property
     def total_pnl(self) -> float:
         """Total P&L = Realized (from closed trades) + Unrealized (from open positions)"""
-        unrealized = sum(self._get_unrealized_pnl(p) for p in self.positions)
+        # Position and EnhancedPosition both expose market_value/cost_basis/unrealized_pnl
+        unrealized = sum(p.unrealized_pnl for p in self.positions)
         return self.realized_pnl + unrealized
 
-    def _get_market_value(self, position: Union[Position, EnhancedPosition]) -> float:
-        """Get market value of position regardless of type"""
-        if hasattr(position, 'market_value'):
-            return position.market_value
-        else:
-            return position.quantity * position.current_price
-
-    def _get_cost_basis(self, position: Union[Position, EnhancedPosition]) -> float:
-        """Get cost basis of position regardless of type"""
-        if hasattr(position, 'cost_basis'):
-            return position.cost_basis
-        else:
-            return position.quantity * position.avg_buy_price
-
-    def _get_unrealized_pnl(self, position: Union[Position, EnhancedPosition]) -> float:
-        """Get unrealized P&L of position regardless of type"""
-        if hasattr(position, 'unrealized_pnl'):
-            return position.unrealized_pnl
-        else:
-            market_value = position.quantity * position.current_price
-            cost_basis = position.quantity * position.avg_buy_price
-            return market_value - cost_basis
-
-@dataclass
+@dataclass(slots=True)
 class GameState:
     """Current game state"""
     player_name: str
@@ -85,19 +209,22 @@ class GameState:
     initial_capital: float
     portfolio: Portfolio
     created_at: datetime = field(default_factory=datetime.now)
-    portfolio_history: List[dict] = field(default_factory=list)  # Track history for charts and coach memory
+    portfolio_history: deque = field(default_factory=lambda: deque(maxlen=PORTFOLIO_HISTORY_LIMIT))  # Track history for charts and coach memory
+
+    def __post_init__(self):
+        """Bound a caller-supplied history list to the last PORTFOLIO_HISTORY_LIMIT entries"""
+        if not isinstance(self.portfolio_history, deque) or self.portfolio_history.maxlen != PORTFOLIO_HISTORY_LIMIT:
+            self.portfolio_history = deque(self.portfolio_history, maxlen=PORTFOLIO_HISTORY_LIMIT)
     
     def record_portfolio_state(self) -> None:
         """Record current portfolio state for history tracking"""
+        positions_value, _, unrealized = self.portfolio.snapshot()
         state = {
             "day": self.current_day,
-            "total_value": self.portfolio.total_value,
+            "total_value": self.portfolio.cash + positions_value,
             "cash": self.portfolio.cash,
-            "positions_value": self.portfolio.positions_value,
-            "pnl": self.portfolio.total_pnl
+            "positions_value": positions_value,
+            "pnl": self.portfolio.realized_pnl + unrealized
         }
-        self.portfolio_history.append(state)
-        
-        # Keep only recent history to prevent memory bloat (e.g., last 300 days)
-        if len(self.portfolio_history) > 300:
-            self.portfolio_history = self.portfolio_history[-300:]
\ No newline at end of file
+        # Bounded deque drops the oldest day once the limit is reached
+        self.portfolio_history.append(state)
\ No newline at end of file
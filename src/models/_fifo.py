@@ -0,0 +1,46 @@
+"""FIFO lot-matching kernel over transaction columns, JIT-compiled with Numba when installed"""
+import numpy as np
+from src.utils.performance import njit
+
+@njit(cache=True)
+def fifo_match(qty: np.ndarray, price: np.ndarray, is_buy: np.ndarray) -> tuple:
+    """
+    Match each SELL against the oldest open BUY lots
+
+    Returns: (buy_index, sell_index, quantity, pnl) arrays, one entry per match
+    """
+    n = qty.shape[0]
+    # Every match either closes a buy lot or finishes a sell, so there are at most n
+    buy_index = np.empty(n, dtype=np.int64)
+    sell_index = np.empty(n, dtype=np.int64)
+    matched_qty = np.empty(n, dtype=np.int64)
+    pnl = np.empty(n, dtype=np.float64)
+
+    remaining = qty.copy()
+    open_lots = np.empty(n, dtype=np.int64)  # Queue of buy indices: open_lots[head:tail]
+    head = 0
+    tail = 0
+    m = 0
+
+    for i in range(n):
+        if is_buy[i]:
+            open_lots[tail] = i
+            tail += 1
+            continue
+
+        sell_quantity = qty[i]
+        while sell_quantity > 0 and head < tail:
+            b = open_lots[head]
+            sold = min(remaining[b], sell_quantity)
+            buy_index[m] = b
+            sell_index[m] = i
+            matched_qty[m] = sold
+            pnl[m] = sold * (price[i] - price[b])
+            m += 1
+
+            remaining[b] -= sold
+            sell_quantity -= sold
+            if remaining[b] == 0:
+                head += 1  # Lot fully sold
+
+    return buy_index[:m], sell_index[:m], matched_qty[:m], pnl[:m]
@@ -4,14 +4,19 @@ Enhanced Position Model with Transaction History and XIRR Calculation
 This module implements an improved position model that tracks individual transactions
 instead of just averaging buy prices, allowing for proper XIRR calculations.
 """
+import sys
 from dataclasses import dataclass, field
 from datetime import datetime, date
-from typing import List, Union
+from typing import List, Optional, Union
 from enum import Enum
-from src.utils.xirr_calculator import TransactionType, calculate_position_xirr
+import numpy as np
+from src.utils.xirr_calculator import TransactionType, xirr_from_days
 from src.database.models import Transaction
+from src.models._fifo import fifo_match
 
-@dataclass
+_BUY = TransactionType.BUY  # Enum members are singletons, so hot loops compare with `is`
+
+@dataclass(slots=True)
 class PositionTransaction:
     """Represents a buy/sell transaction for position tracking"""
     date: Union[datetime, date]
@@ -21,7 +26,14 @@ class PositionTransaction:
     commission: float = 0.0  # Transaction cost (default 0 for backward compatibility)
 
 
-@dataclass
+def _grown(column: np.ndarray, capacity: int) -> np.ndarray:
+    """Copy a column into a new buffer of the given capacity"""
+    grown = np.empty(capacity, dtype=column.dtype)
+    grown[:len(column)] = column
+    return grown
+
+
+@dataclass(slots=True)
 class EnhancedPosition:
     """Enhanced position that tracks individual transactions for proper XIRR calculations"""
 
@@ -33,14 +45,56 @@ class EnhancedPosition:
     _quantity: int = field(default=0, init=False)
     _avg_buy_price: float = field(default=0.0, init=False)
     _cost_basis: float = field(default=0.0, init=False)
+    _total_bought_quantity: int = field(default=0, init=False)  # Sum of BUY quantities
+    # False while the history is BUY-only, which lets valuation and FIFO skip the general path
+    _any_sell: bool = field(default=False, init=False)
+    # Derived from price and quantity, refreshed on every price/quantity write
+    _market_value: float = field(default=0.0, init=False)
+    _unrealized_pnl: float = field(default=0.0, init=False)
+    _unrealized_pnl_pct: float = field(default=0.0, init=False)
+    # Structure-of-arrays mirror of transactions, for vectorized reductions.
+    # Columns are over-allocated buffers; only the first _n entries are valid.
+    _n: int = field(default=0, init=False, repr=False, compare=False)
+    _qty: np.ndarray = field(default=None, init=False, repr=False, compare=False)
+    _price: np.ndarray = field(default=None, init=False, repr=False, compare=False)
+    _is_buy: np.ndarray = field(default=None, init=False, repr=False, compare=False)
+    _commission: np.ndarray = field(default=None, init=False, repr=False, compare=False)
+    _date_ord: np.ndarray = field(default=None, init=False, repr=False, compare=False)  # date.toordinal()
+    # Derived at insert so the recalculation reductions are plain sums: +qty for BUY, -qty for SELL,
+    # and qty * price + commission for BUY (0 for SELL)
+    _signed_qty: np.ndarray = field(default=None, init=False, repr=False, compare=False)
+    _buy_notional: np.ndarray = field(default=None, init=False, repr=False, compare=False)
+    # ((transaction count, current price, current date), xirr) of the last calculate_xirr call
+    _xirr_cache: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+    # ((transaction count, current price), per-transaction P&L array)
+    _pnl_cache: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+    # (transaction count, results) of the last get_fifo_sells call
+    _fifo_cache: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
 
     def __init__(self, symbol: str, current_price: float, transactions: List[PositionTransaction] = None):
         """Initialize position with symbol and current price"""
-        self.symbol = symbol
+        self.symbol = sys.intern(symbol)
         self._current_price = current_price
         self.transactions = transactions if transactions is not None else []
+        self._fifo_cache = None
         self._recalculate_position()
 
+    @classmethod
+    def from_legacy(cls, position, purchase_date: Union[datetime, date]) -> "EnhancedPosition":
+        """Upgrade a legacy Position (quantity + avg price only) to a transaction-tracked position
+
+        The legacy model has no purchase history, so its holdings become a single BUY
+        dated purchase_date. XIRR for the upgraded position is only as accurate as that date.
+        """
+        enhanced_pos = cls(symbol=position.symbol, current_price=position.current_price)
+        enhanced_pos.add_transaction(PositionTransaction(
+            date=purchase_date,
+            quantity=position.quantity,
+            price=position.avg_buy_price,
+            transaction_type=TransactionType.BUY
+        ))
+        return enhanced_pos
+
     @property
     def current_price(self) -> float:
         """Get current price"""
@@ -50,7 +104,8 @@ class EnhancedPosition:
     def current_price(self, value: float):
         """Set current price and recalculate dependent values"""
         self._current_price = value
-        # No need to recalculate quantity/avg_buy_price/cost_basis as they don't depend on current_price
+        # Only the valuation depends on current_price - quantity/avg_buy_price/cost_basis don't
+        self._refresh_valuation()
 
     @property
     def quantity(self) -> int:
@@ -69,27 +124,35 @@ class EnhancedPosition:
 
     @property
     def market_value(self) -> float:
-        """Calculate market value dynamically based on current price"""
-        return abs(self._quantity) * self._current_price
+        """Market value at the current price (kept up to date by the price and quantity writers)"""
+        return self._market_value
 
     @property
     def unrealized_pnl(self) -> float:
-        """Calculate unrealized P&L dynamically"""
-        if self._quantity > 0:
-            # Calculate proportional cost basis for remaining shares
-            total_bought_quantity = sum(t.quantity for t in self.transactions if t.transaction_type == TransactionType.BUY)
-            if total_bought_quantity > 0:
-                avg_cost_per_share = self._cost_basis / total_bought_quantity
-                remaining_cost_basis = avg_cost_per_share * self._quantity
-                return self.market_value - remaining_cost_basis
-        return 0.0
+        """Unrealized P&L at the current price"""
+        return self._unrealized_pnl
 
     @property
     def unrealized_pnl_pct(self) -> float:
-        """Calculate unrealized P&L percentage dynamically"""
-        if self._cost_basis > 0:
-            return (self.unrealized_pnl / self._cost_basis) * 100
-        return 0.0
+        """Unrealized P&L as a percentage of cost basis"""
+        return self._unrealized_pnl_pct
+
+    def _refresh_valuation(self) -> None:
+        """Recompute market value and unrealized P&L after a price or quantity change"""
+        self._market_value = abs(self._quantity) * self._current_price
+
+        unrealized = 0.0
+        if not self._any_sell:
+            # Every share bought is still held, so the full cost basis applies
+            if self._quantity > 0:
+                unrealized = self._market_value - self._cost_basis
+        elif self._quantity > 0 and self._total_bought_quantity > 0:
+            # Calculate proportional cost basis for remaining shares
+            avg_cost_per_share = self._cost_basis / self._total_bought_quantity
+            remaining_cost_basis = avg_cost_per_share * self._quantity
+            unrealized = self._market_value - remaining_cost_basis
+        self._unrealized_pnl = unrealized
+        self._unrealized_pnl_pct = (unrealized / self._cost_basis) * 100 if self._cost_basis > 0 else 0.0
 
     def __post_init__(self):
         """This won't be called since we override __init__"""
@@ -97,127 +160,201 @@ class EnhancedPosition:
     
     def add_transaction(self, transaction: PositionTransaction) -> None:
         """Add a new transaction to the position"""
+        if not isinstance(transaction, PositionTransaction):
+            # Normalize foreign transaction objects once here, so every reader can rely on .commission
+            transaction = PositionTransaction(
+                date=transaction.date,
+                quantity=transaction.quantity,
+                price=transaction.price,
+                transaction_type=transaction.transaction_type,
+                commission=getattr(transaction, 'commission', 0.0)
+            )
         self.transactions.append(transaction)
-        self._recalculate_position()
-    
+        self._append_arrays(transaction)
+        self._apply_transaction(transaction)
+
+    def _append_arrays(self, trans: PositionTransaction) -> None:
+        """Mirror one appended transaction into the structure-of-arrays columns"""
+        n = self._n
+        if n == len(self._qty):
+            # Full - double the capacity so appends stay amortized O(1)
+            capacity = max(2 * n, 8)
+            self._qty = _grown(self._qty, capacity)
+            self._price = _grown(self._price, capacity)
+            self._is_buy = _grown(self._is_buy, capacity)
+            self._commission = _grown(self._commission, capacity)
+            self._date_ord = _grown(self._date_ord, capacity)
+            self._signed_qty = _grown(self._signed_qty, capacity)
+            self._buy_notional = _grown(self._buy_notional, capacity)
+        self._qty[n] = trans.quantity
+        self._price[n] = trans.price
+        is_buy = trans.transaction_type is _BUY
+        self._is_buy[n] = is_buy
+        self._commission[n] = trans.commission
+        self._date_ord[n] = trans.date.toordinal()
+        self._signed_qty[n] = trans.quantity if is_buy else -trans.quantity
+        self._buy_notional[n] = trans.quantity * trans.price + trans.commission if is_buy else 0.0
+        self._n = n + 1
+
+    def _apply_transaction(self, trans: PositionTransaction) -> None:
+        """Fold one transaction into the cached position metrics (O(1))"""
+        if trans.transaction_type is _BUY:
+            self._quantity += trans.quantity
+            self._total_bought_quantity += trans.quantity
+            # FIX: Include commission in cost basis
+            self._cost_basis += trans.quantity * trans.price + trans.commission
+            # Avg buy price is based on total bought quantity
+            if self._total_bought_quantity > 0:
+                self._avg_buy_price = self._cost_basis / self._total_bought_quantity
+        else:
+            # A SELL only changes quantity - cost basis and avg buy price come from BUYs
+            self._quantity -= trans.quantity
+            self._any_sell = True
+        self._refresh_valuation()
+
     def _recalculate_position(self) -> None:
-        """Recalculate position metrics based on all transactions"""
-        # Calculate quantity by summing all transactions
-        total_quantity = 0
-        total_cost_basis = 0
-
-        for trans in self.transactions:
-            if trans.transaction_type == TransactionType.BUY:
-                total_quantity += trans.quantity  # quantity for buys
-                # FIX: Include commission in cost basis (with backward compatibility)
-                commission = trans.commission if hasattr(trans, 'commission') else 0.0
-                total_cost_basis += (trans.quantity * trans.price + commission)
-            else:  # SELL
-                total_quantity -= trans.quantity  # quantity for sells
-
-        self._quantity = total_quantity
-        self._cost_basis = total_cost_basis  # Total cost basis from all BUY transactions
-
-        # Calculate avg buy price based on total bought quantity
-        total_bought_quantity = sum(trans.quantity for trans in self.transactions if trans.transaction_type == TransactionType.BUY)
-        self._avg_buy_price = self._cost_basis / total_bought_quantity if total_bought_quantity > 0 else 0
-
-        # Note: market_value, unrealized_pnl, and unrealized_pnl_pct are now @property methods
-        # that calculate dynamically based on current_price
-    
+        """Recalculate position metrics from scratch based on all transactions (bulk load)"""
+        transactions = self.transactions
+        n = len(transactions)
+        self._qty = np.fromiter((t.quantity for t in transactions), dtype=np.int64, count=n)
+        self._price = np.fromiter((t.price for t in transactions), dtype=np.float64, count=n)
+        self._is_buy = np.fromiter(
+            (t.transaction_type is _BUY for t in transactions), dtype=bool, count=n
+        )
+        # FIX: Include commission in cost basis
+        self._commission = np.fromiter((t.commission for t in transactions), dtype=np.float64, count=n)
+        self._date_ord = np.fromiter((t.date.toordinal() for t in transactions), dtype=np.int64, count=n)
+        self._n = n
+
+        is_buy = self._is_buy
+        self._signed_qty = np.where(is_buy, self._qty, -self._qty)
+        self._buy_notional = np.where(is_buy, self._qty * self._price + self._commission, 0.0)
+
+        # Each metric is a single contiguous reduction, run in C instead of the interpreter loop
+        self._quantity = int(self._signed_qty.sum())
+        self._cost_basis = float(self._buy_notional.sum())
+        self._total_bought_quantity = int(self._qty[is_buy].sum())
+        self._any_sell = not is_buy.all()
+        self._avg_buy_price = (
+            self._cost_basis / self._total_bought_quantity if self._total_bought_quantity > 0 else 0.0
+        )
+        self._refresh_valuation()
+        self._fifo_cache = None  # History may have been replaced wholesale
+        self._xirr_cache = None
+        self._pnl_cache = None
+
     def calculate_xirr(self, current_date: Union[datetime, date] = None) -> float:
         """Calculate XIRR for this position"""
         if current_date is None:
             current_date = datetime.now().date()
         
-        # Convert our transactions to the format expected by the XIRR calculator
-        from src.utils.xirr_calculator import Transaction as XirrTransaction
-        xirr_transactions = []
-        for trans in self.transactions:
-            # Convert to the XIRR calculator's Transaction format
-            # Amount is: negative for buys (cash outflow), positive for sells (cash inflow)
-            trans_amount = trans.quantity * trans.price  # quantity * price = transaction value
-            if trans.transaction_type == TransactionType.BUY:
-                trans_amount = -abs(trans_amount)  # Negative for buys
-            else:  # SELL
-                trans_amount = abs(trans_amount)  # Positive for sells
-            
-            xirr_transactions.append(XirrTransaction(
-                date=trans.date,
-                amount=trans_amount,
-                transaction_type=trans.transaction_type
-            ))
-        
-        current_value = self.quantity * self.current_price
-        return calculate_position_xirr(xirr_transactions, current_value, current_date)
+        # Memoized until a transaction is added or the price/date changes
+        pending = self.xirr_inputs(current_date)
+        if pending is None:
+            return self._xirr_cache[1]
+        key, flows = pending
+        result = self.solve_cash_flows(flows)
+        self._xirr_cache = (key, result)
+        return result
+
+    def xirr_inputs(self, current_date: date) -> Optional[tuple]:
+        """(cache key, cash flows) to solve for current_date, or None if the XIRR memo already holds it
+
+        The flows are fresh arrays, so they can be solved on another thread while this position
+        keeps changing; pass the result back through store_xirr.
+        """
+        n = len(self.transactions)
+        key = (n, self._current_price, current_date)
+        if self._xirr_cache is not None and self._xirr_cache[0] == key:
+            return None
+        if self._n != n:
+            self._recalculate_position()  # transactions list was modified directly
+        return key, self._cash_flows(n, current_date)
+
+    def store_xirr(self, key: tuple, result: float) -> None:
+        """Memoize an XIRR solved from xirr_inputs under the key it was built with"""
+        self._xirr_cache = (key, result)
+
+    def _cash_flows(self, n: int, current_date: date) -> Optional[tuple]:
+        """(days, amounts) from the cached columns: BUYs are outflows, SELLs inflows, current value closes
+
+        None when there is nothing to solve (no transactions, or all on one day).
+        """
+        if n == 0:
+            return None
+
+        ordinals = np.append(self._date_ord[:n], current_date.toordinal())
+        if ordinals.min() == ordinals.max():
+            return None  # Cannot calculate XIRR for same-day transactions
+
+        trade_values = np.abs(self._qty[:n] * self._price[:n])
+        amounts = np.append(np.where(self._is_buy[:n], -trade_values, trade_values),
+                            self.quantity * self._current_price)
+
+        # Chronological order, as the solver expects
+        order = np.argsort(ordinals, kind='stable')
+        return ordinals[order] - ordinals[order[0]], amounts[order]
+
+    @staticmethod
+    def solve_cash_flows(flows: Optional[tuple]) -> float:
+        """XIRR for cash flows from xirr_inputs; touches no position state"""
+        if flows is None:
+            return 0.0
+        days, amounts = flows
+        try:
+            result = xirr_from_days(days, amounts)
+        except Exception:
+            return 0.0
+        # Ensure result is reasonable
+        if result < -1 or result > 10:
+            return 0.0
+        return result
     
     def calculate_pnl_for_transaction(self, index: int) -> float:
         """Calculate P&L for a specific buy transaction"""
-        if index >= len(self.transactions) or self.transactions[index].transaction_type != TransactionType.BUY:
+        if index >= len(self.transactions) or self.transactions[index].transaction_type is not _BUY:
             return 0.0  # Only calculate for buy transactions
-        
-        buy_transaction = self.transactions[index]
-        buy_price = buy_transaction.price
-        buy_quantity = buy_transaction.quantity
-        current_value = buy_quantity * self.current_price
-        buy_cost = buy_quantity * buy_price
-        
-        return current_value - buy_cost
+        return float(self._transaction_pnl()[index])
+
+    def calculate_pnl_all_buys(self) -> np.ndarray:
+        """P&L at the current price of every buy transaction, in transaction order"""
+        n = len(self.transactions)
+        return self._transaction_pnl()[self._is_buy[:n]]
+
+    def _transaction_pnl(self) -> np.ndarray:
+        """Per-transaction P&L at the current price (0 for sells), cached until the price or history changes"""
+        n = len(self.transactions)
+        if self._pnl_cache is not None and self._pnl_cache[0] == (n, self._current_price):
+            return self._pnl_cache[1]
+        if self._n != n:
+            self._recalculate_position()  # transactions list was modified directly
+
+        qty = self._qty[:n]
+        pnl = np.where(self._is_buy[:n], qty * self._current_price - qty * self._price[:n], 0.0)
+        self._pnl_cache = ((n, self._current_price), pnl)
+        return pnl
     
     def get_fifo_sells(self) -> List[dict]:
-        """Return FIFO (First In, First Out) based P&L for all transactions"""
-        if not self.transactions:
-            return []
-        
-        # Track which buy transactions are sold against which sell transactions
-        buy_queue = []
-        results = []
-        
-        for i, trans in enumerate(self.transactions):
-            if trans.transaction_type == TransactionType.BUY:
-                # Add buy transaction to queue
-                buy_queue.append({
-                    'index': i,
-                    'quantity': trans.quantity,
-                    'price': trans.price,
-                    'remaining': trans.quantity
-                })
-            else:  # SELL
-                sell_quantity = trans.quantity
-                sell_price = trans.price
-                
-                # Match against FIFO buy transactions
-                while sell_quantity > 0 and buy_queue:
-                    buy_trans = buy_queue[0]
-                    
-                    if buy_trans['remaining'] <= sell_quantity:
-                        # Sell all of this buy transaction
-                        sold_quantity = buy_trans['remaining']
-                        pnl = sold_quantity * (sell_price - buy_trans['price'])
-                        results.append({
-                            'buy_index': buy_trans['index'],
-                            'sell_index': i,
-                            'quantity': sold_quantity,
-                            'pnl': pnl
-                        })
-                        
-                        sell_quantity -= sold_quantity
-                        buy_queue.pop(0)  # Remove this buy from queue
-                    else:
-                        # Sell only part of this buy transaction
-                        sold_quantity = sell_quantity
-                        pnl = sold_quantity * (sell_price - buy_trans['price'])
-                        results.append({
-                            'buy_index': buy_trans['index'],
-                            'sell_index': i,
-                            'quantity': sold_quantity,
-                            'pnl': pnl
-                        })
-                        
-                        buy_trans['remaining'] -= sold_quantity
-                        sell_quantity = 0
-        
-        return results
+        """Return FIFO (First In, First Out) based P&L for all transactions
+
+        Matching runs in the compiled fifo_match kernel over the transaction
+        columns; the result is cached until a transaction is added.
+        """
+        n = len(self.transactions)
+        if self._n != n:
+            self._recalculate_position()  # transactions list was modified directly
+        if not self._any_sell:
+            return []  # Nothing to match against
+        if self._fifo_cache is not None and self._fifo_cache[0] == n:
+            return list(self._fifo_cache[1])
+
+        buy_index, sell_index, matched_qty, pnl = fifo_match(self._qty[:n], self._price[:n], self._is_buy[:n])
+        results = [
+            {'buy_index': b, 'sell_index': i, 'quantity': q, 'pnl': p}
+            for b, i, q, p in zip(buy_index.tolist(), sell_index.tolist(), matched_qty.tolist(), pnl.tolist())
+        ]
+        self._fifo_cache = (n, results)
+        return list(results)
 
 
 # Example usage and test function
@@ -1,30 +1,38 @@
 """Main Textual application"""
 from textual.app import App, ComposeResult
 from textual.binding import Binding
+import atexit
+import importlib
 import logging
+import logging.handlers
+import queue
+import time
 from src.tui.screens.menu_screen import MenuScreen
-from src.tui.screens.main_screen import MainScreen
 from src.tui.screens.dashboard_screen import DashboardScreen
 from src.models import GameState, Portfolio, Position
-from src.config import INITIAL_CAPITAL, DEFAULT_USERNAME, DEFAULT_STOCKS, DATA_DIR, DEFAULT_TOTAL_DAYS
-from src.database import init_db, get_session, User, Game
+from src.config import (
+    INITIAL_CAPITAL, DEFAULT_USERNAME, DEFAULT_STOCKS, DATA_DIR, DEFAULT_TOTAL_DAYS, SAVE_DEBOUNCE_SECONDS,
+    EXCEPTION_COALESCE_SECONDS
+)
+from src.database import init_db, get_session, prewarm_pool, User, Game
 from src.database.dao import GameDAO, UserDAO
-from src.data import MarketDataLoader
-from src.data.enhanced_loader import EnhancedMarketDataLoader
-from src.coach.enhanced_manager import EnhancedCoachManager
 import asyncio
-from datetime import datetime
-from src.models.transaction_models import EnhancedPosition
-from src.utils.xirr_calculator import Transaction, TransactionType
-
-# Setup logging
+from typing import Optional
+
+# Setup logging: records are queued on the calling thread and written to disk by a listener thread,
+# so logging from the event loop never blocks on file I/O
+_log_queue = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(
+    _log_queue,
+    logging.FileHandler(DATA_DIR / "artha.log"),
+    logging.StreamHandler()
+)
+_log_listener.start()
+atexit.register(_log_listener.stop)
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(DATA_DIR / "artha.log"),
-        logging.StreamHandler()
-    ]
+    handlers=[logging.handlers.QueueHandler(_log_queue)]
 )
 
 logger = logging.getLogger(__name__)
@@ -41,18 +49,47 @@ class ArthaApp(App):
 
     def __init__(self):
         super().__init__()
-        # Use EnhancedMarketDataLoader for realistic market simulation
-        try:
-            self.market_data = EnhancedMarketDataLoader()
-        except ImportError:
-            # Fallback to basic MarketDataLoader if enhanced version is not available
-            self.market_data = MarketDataLoader()
-        
-        self.coach = EnhancedCoachManager()  # Using enhanced coach
-        self.game_state = self._create_mock_game()
+        # Heavy setup (price preload, coach, mock game) runs in _bootstrap after the first paint
+        self.market_data = None
+        self.coach = None
+        self.game_state = None
+        # Set once database init has finished - tables exist, or init failed; DB work waits on it
+        self._db_ready = asyncio.Event()
+        # Exception that stopped _init_database, if any; checked by waiters on _db_ready
+        self._db_error: Optional[BaseException] = None
+        # Set once _bootstrap has finished - built the game and installed the "main" screen, or failed
+        self._game_ready = asyncio.Event()
+        # Exception that stopped _bootstrap, if any; checked by waiters on _game_ready
+        self._bootstrap_error: Optional[BaseException] = None
+        # Startup tasks, held so they aren't garbage collected mid-run
+        self._db_task: Optional[asyncio.Task] = None
+        self._bootstrap_task: Optional[asyncio.Task] = None
+        # Default user row, resolved on first DB access (DEFAULT_USERNAME never changes at runtime)
+        self._cached_user: Optional[User] = None
+        # DB id of the game being played, assigned by the first save
+        self.current_game_id: Optional[int] = None
+        # Last reported exception (type name, message prefix), when it was reported, and repeats since
+        self._last_exc_key: Optional[tuple] = None
+        self._last_exc_time = 0.0
+        self._suppressed_exc_count = 0
+        # Scheduled coalesced save, if one is waiting out the debounce window
+        self._save_pending: Optional[asyncio.Task] = None
+        # Held for the duration of a save, so at most one write runs and one waits behind it
+        self._save_lock = asyncio.Lock()
 
     def on_exception(self, exception: Exception) -> None:
-        """Handle exceptions"""
+        """Handle exceptions - identical ones in quick succession are counted, not re-reported"""
+        key = (type(exception).__name__, str(exception)[:80])
+        now = time.monotonic()
+        if key == self._last_exc_key and now - self._last_exc_time < EXCEPTION_COALESCE_SECONDS:
+            self._suppressed_exc_count += 1
+            return
+        if self._suppressed_exc_count:
+            logger.error(f"Previous exception repeated {self._suppressed_exc_count} more time(s)")
+        self._last_exc_key = key
+        self._last_exc_time = now
+        self._suppressed_exc_count = 0
+
         logger.error(f"Exception: {exception}", exc_info=True)
         self.notify(
             f"An error occurred. Check logs for details.",
@@ -61,18 +98,18 @@ class ArthaApp(App):
 
     def _create_mock_game(self) -> GameState:
         """Create mock game with REAL prices using enhanced position model"""
-        from src.config import DEFAULT_STOCKS
+        from src.models.transaction_models import EnhancedPosition, PositionTransaction
+        from src.utils.xirr_calculator import TransactionType
 
-        # Preload stock data
-        self.market_data.preload_stocks(DEFAULT_STOCKS)
+        # Stock data is preloaded by _bootstrap
+        symbols = DEFAULT_STOCKS[:3]  # Use first 3
+        # Current price and the price 5 days ago (simulated buy) in one batched lookup
+        prices = self.market_data.get_prices_bulk(symbols, [0, 5])
 
         # Create enhanced positions with real prices
         positions = []
-        for symbol in DEFAULT_STOCKS[:3]:  # Use first 3
-            current_price = self.market_data.get_current_price(symbol)
-            # Simulate buying 5 days ago
-            buy_price = self.market_data.get_price_at_day(symbol, 5)
-
+        pending_buys = []  # (quantity, buy_price) per position, recorded once game time is known
+        for symbol, (current_price, buy_price) in prices.items():
             if current_price > 0 and buy_price > 0:
                 # Calculate quantity to invest ~₹1.2L per stock
                 quantity = int(120000 / buy_price)
@@ -86,8 +123,7 @@ class ArthaApp(App):
                 positions.append(enhanced_pos)
 
                 # Store the buy data for later use (after game state is created)
-                positions[-1]._pending_quantity = quantity
-                positions[-1]._pending_buy_price = buy_price
+                pending_buys.append((quantity, buy_price))
 
         # Create game state first to get created_at timestamp
         game_state = GameState(
@@ -99,51 +135,115 @@ class ArthaApp(App):
         )
 
         # Now add transactions with dates based on game time
-        from datetime import datetime, timedelta
-        from src.models.transaction_models import PositionTransaction
-        from src.utils.xirr_calculator import TransactionType
-
         # Purchase date = game start date (created_at)
         # Game is on day 5, so purchases were made on day 0 (game start)
         game_start_date = game_state.created_at.date()
+        buy = TransactionType.BUY
 
-        for pos in positions:
+        invested = 0.0  # Running total of cost basis, accumulated as each buy is recorded
+        for pos, (quantity, buy_price) in zip(positions, pending_buys):
             # Add transaction with correct date using stored pending data
             initial_transaction = PositionTransaction(
                 date=game_start_date,
-                quantity=pos._pending_quantity,
-                price=pos._pending_buy_price,
-                transaction_type=TransactionType.BUY
+                quantity=quantity,
+                price=buy_price,
+                transaction_type=buy
             )
             pos.add_transaction(initial_transaction)
+            invested += pos.cost_basis
 
-            # Clean up temporary attributes
-            delattr(pos, '_pending_quantity')
-            delattr(pos, '_pending_buy_price')
-
-        # Calculate remaining cash after all transactions are added
-        invested = sum(p.cost_basis for p in positions)
+        # Remaining cash after all transactions are added
         game_state.portfolio.cash = INITIAL_CAPITAL - invested
 
         return game_state
 
+    async def _bootstrap(self) -> None:
+        """Load market data, the coach and the starting game without blocking the first frame
+
+        Runs alongside _init_database; every slow step here is either on a worker thread
+        or overlapped with one, so the loop stays free to finish the DB setup.
+        """
+        try:
+            # Imported here: yfinance/pandas and DSPy dominate import time and aren't needed for the menu.
+            # Executing them on a worker keeps the loop serving init_db and the menu meanwhile.
+            await asyncio.to_thread(importlib.import_module, "src.data")
+            await asyncio.to_thread(importlib.import_module, "src.coach.enhanced_manager")
+            from src.data import get_shared_loader
+            from src.coach.enhanced_manager import EnhancedCoachManager
+
+            # Shared across app instances so restarts reuse already-loaded prices
+            self.market_data = get_shared_loader()
+            # Submitted to the executor immediately, so the preload runs while the coach is built here
+            preload = asyncio.get_running_loop().run_in_executor(
+                None, self.market_data.preload_stocks, DEFAULT_STOCKS
+            )
+            self.coach = EnhancedCoachManager()  # Using enhanced coach (DSPy is configured on this thread)
+            await preload
+            self.game_state = await asyncio.to_thread(self._create_mock_game)
+
+            # Use dashboard screen, built on first push - which also picks up a game chosen from the menu by then
+            self.install_screen(lambda: DashboardScreen(self.game_state), name="main")
+        except Exception as e:
+            # Recorded rather than raised: menu handlers waiting on _game_ready report it to the player
+            self._bootstrap_error = e
+            logger.error(f"Startup failed: {e}", exc_info=True)
+            self.notify(f"Failed to start game: {e}", severity="error")
+        finally:
+            self._game_ready.set()
+
     async def _init_database(self):
         """Initialize database"""
-        await init_db()
+        try:
+            await init_db()
+        except Exception as e:
+            # Recorded rather than raised: saves and loads waiting on _db_ready check it
+            self._db_error = e
+            logger.error(f"Database initialization failed: {e}", exc_info=True)
+            self.notify(f"Database unavailable: {e}", severity="error")
+            return
+        finally:
+            self._db_ready.set()
+        # Fill the pool now so the first save/load runs on a hot connection
+        try:
+            await prewarm_pool()
+        except Exception as e:
+            logger.warning(f"Connection pool prewarm failed: {e}")
+
+    async def _wait_for_db(self) -> bool:
+        """Wait for database init; False (and the player is told) if it failed"""
+        await self._db_ready.wait()
+        if self._db_error is None:
+            return True
+        self.notify(f"Database unavailable: {self._db_error}", severity="error")
+        return False
+
+    async def _get_user(self, session) -> User:
+        """Default user, fetched or created once and then served from memory"""
+        if self._cached_user is None:
+            self._cached_user = await UserDAO.get_or_create_user(
+                session,
+                username=DEFAULT_USERNAME,
+                full_name="Demo Player"
+            )
+        return self._cached_user
 
     async def _load_or_create_game(self) -> GameState:
         """Load latest game or create mock"""
         try:
-            async for session in get_session():
-                # Get or create default user
-                user = await UserDAO.get_or_create_user(
-                    session,
-                    username=DEFAULT_USERNAME,
-                    full_name="Demo Player"
-                )
-
-                # Try to load latest game
-                game = await GameDAO.get_latest_game(session, user.id)
+            if not await self._wait_for_db():
+                return None
+            async with get_session() as session:
+                if self._cached_user is None:
+                    # Get or create default user and their latest game in one round trip
+                    user, game = await UserDAO.get_user_and_latest_game(
+                        session,
+                        username=DEFAULT_USERNAME,
+                        full_name="Demo Player"
+                    )
+                    self._cached_user = user
+                else:
+                    user = self._cached_user
+                    game = await GameDAO.get_latest_game(session, user.id)
 
                 if game:
                     # Convert DB game to GameState
@@ -155,16 +255,30 @@ class ArthaApp(App):
             self.log(f"Error loading game: {e}")
             return None
 
+    def _request_save(self) -> None:
+        """Schedule a save; requests within SAVE_DEBOUNCE_SECONDS share a single write"""
+        if self._save_pending is None:
+            self._save_pending = asyncio.create_task(self._debounced_save())
+
+    async def _debounced_save(self) -> None:
+        """Wait out the debounce window, then save once; saves never overlap"""
+        await asyncio.sleep(SAVE_DEBOUNCE_SECONDS)
+        async with self._save_lock:
+            # Cleared once this save owns the lock: requests made while an earlier write
+            # was running fold into this one, and requests during this write queue one more
+            self._save_pending = None
+            await self._save_current_game()
+
     async def _save_current_game(self):
         """Save current game state"""
         try:
-            async for session in get_session():
-                # Get user
-                user = await UserDAO.get_or_create_user(session, DEFAULT_USERNAME, full_name="Demo Player")
-
+            if not await self._wait_for_db():
+                return
+            async with get_session() as session:
                 # Check if we have a game_id stored
-                if not hasattr(self, 'current_game_id'):
-                    # Create new game
+                if self.current_game_id is None:
+                    # Create new game - the only step that needs the user
+                    user = await self._get_user(session)
                     game = await GameDAO.create_game(
                         session,
                         user_id=user.id,
@@ -174,20 +288,21 @@ class ArthaApp(App):
                     )
                     self.current_game_id = game.id
 
-                # Save game state
+                # Save game state and positions in one transaction - a single commit
                 await GameDAO.save_game_state(
                     session,
                     self.current_game_id,
                     self.game_state.portfolio.cash,
-                    self.game_state.current_day
+                    self.game_state.current_day,
+                    commit=False
                 )
-
-                # Save positions
                 await GameDAO.save_positions(
                     session,
                     self.current_game_id,
-                    self.game_state.portfolio.positions
+                    self.game_state.portfolio.positions,
+                    commit=False
                 )
+                await session.commit()
 
                 self.notify("Game saved!")
         except Exception as e:
@@ -196,9 +311,9 @@ class ArthaApp(App):
     def on_mount(self) -> None:
         """Initialize app - UPDATED"""
         # Initialize database
-        asyncio.create_task(self._init_database())
+        self._db_task = asyncio.create_task(self._init_database())
 
-        # Install screens
+        # Menu renders immediately; the game screen is installed once _bootstrap finishes
         self.install_screen(MenuScreen(), name="menu")
-        self.install_screen(DashboardScreen(self.game_state), name="main")  # Use dashboard screen
-        self.push_screen("menu")
\ No newline at end of file
+        self.push_screen("menu")
+        self._bootstrap_task = asyncio.create_task(self._bootstrap())
\ No newline at end of file
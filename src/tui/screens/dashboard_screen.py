@@ -1,17 +1,135 @@
 """Professional Trading Terminal Dashboard"""
+import asyncio
+import logging
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from operator import itemgetter
+from typing import TYPE_CHECKING, Dict, Optional
 from textual.app import ComposeResult
-from textual.screen import Screen
-from textual.widgets import Header, Footer, Static, DataTable, SelectionList
+from textual.screen import ModalScreen, Screen
+from textual.widgets import Header, Footer, Static, DataTable, SelectionList, OptionList, Label
+from textual.widgets.option_list import Option
 from textual.containers import Horizontal, Vertical, ScrollableContainer
-from textual.reactive import reactive
-from src.models import GameState
+from src.config import REFRESH_DEBOUNCE_SECONDS
 from src.tui.widgets.chart_widget import PortfolioChartWidget
 from src.tui.widgets.live_ticker import LiveTickerWidget
 from src.tui.widgets.enhanced_watchlist import EnhancedWatchlistWidget
 from src.tui.screens.trade_modal import TradeModal
-from src.engine.trade_executor import TradeExecutor
-from src.utils.xirr_calculator import TransactionType
-import asyncio
+from src.tui.screens.help_screen import HelpScreen
+from src.engine.trade_executor import TradeExecutor, set_simulation_date
+from src.models.transaction_models import EnhancedPosition
+
+if TYPE_CHECKING:
+    from src.models import GameState
+
+logger = logging.getLogger(__name__)
+
+# Portfolio grid (column key, label) in display order
+_GRID_COLUMNS = (
+    ("symbol", "Symbol"),
+    ("quantity", "Quantity"),
+    ("avg_price", "Avg Price"),
+    ("current", "Current"),
+    ("mkt_value", "Mkt Value"),
+    ("pnl", "P&L ₹"),
+    ("pnl_pct", "P&L %"),
+    ("xirr", "XIRR %"),
+    ("days_held", "Days Held"),
+)
+
+
+@lru_cache(maxsize=512, typed=True)
+def _format_metric(label: str, value, prefix="", suffix="", show_sign=False) -> str:
+    """Format metric for display (memoized - the same values recur across refreshes)"""
+    if isinstance(value, float):
+        if show_sign:
+            sign = "+" if value >= 0 else ""
+            return f"{label}\n{sign}{prefix}{value:,.2f}{suffix}"
+        return f"{label}\n{prefix}{value:,.2f}{suffix}"
+    return f"{label}\n{prefix}{value}{suffix}"
+
+
+def _pnl_class(pnl: float) -> str:
+    """Return CSS class based on P&L"""
+    if pnl > 0:
+        return "positive"
+    elif pnl < 0:
+        return "negative"
+    return "neutral"
+
+
+def _fallback_metrics(pos) -> tuple:
+    """(pnl, pnl %, avg price, market value) for position-like objects missing the usual properties"""
+    avg_price = getattr(pos, 'avg_buy_price', pos.current_price)
+    pnl = getattr(pos, 'unrealized_pnl', (pos.current_price - avg_price) * pos.quantity)
+    pnl_pct = getattr(pos, 'unrealized_pnl_pct', 0)
+    market_value = getattr(pos, 'market_value', pos.quantity * pos.current_price)
+    return pnl, pnl_pct, avg_price, market_value
+
+
+class AddStockModal(ModalScreen):
+    """Modal for adding stock to watchlist"""
+
+    CSS = """
+    AddStockModal {
+        align: center middle;
+    }
+
+    #add_stock_dialog {
+        width: 50;
+        height: auto;
+        max-height: 30;
+        background: $surface;
+        border: thick $primary;
+        padding: 1 2;
+    }
+
+    #stock_option_list {
+        height: 15;
+        margin: 1 0;
+        border: solid $accent;
+    }
+    """
+
+    def __init__(self, stocks, watchlist_widget):
+        super().__init__()
+        self.stocks = stocks
+        self.watchlist_widget = watchlist_widget
+        # Symbols the watchlist can show, looked up once instead of scanning options per pick
+        self._selector = watchlist_widget.query_one("#stock-selector", SelectionList)
+        self._selectable = {option.value for option in self._selector.options}
+
+    def compose(self) -> ComposeResult:
+        with Vertical(id="add_stock_dialog"):
+            yield Label("Select stock to add to watchlist:", id="modal_title")
+            option_list = OptionList(id="stock_option_list")
+            for stock in self.stocks:
+                option_list.add_option(Option(stock, id=stock))
+            yield option_list
+            yield Label("Press Enter to add, Esc to cancel", id="modal_hint")
+
+    def on_option_list_option_selected(self, event: OptionList.OptionSelected) -> None:
+        """Add selected stock to watchlist"""
+        stock_symbol = event.option.id
+
+        # Add to watchlist by programmatically selecting it (selections are keyed by symbol)
+        try:
+            if stock_symbol in self._selectable:
+                # Check if already selected
+                if stock_symbol not in self.watchlist_widget.selected_stocks:
+                    self._selector.select(stock_symbol)
+                    self.app.notify(f"✓ Added {stock_symbol} to watchlist", severity="information")
+                else:
+                    self.app.notify(f"ℹ {stock_symbol} already in watchlist", severity="warning")
+        except Exception as e:
+            self.app.notify(f"Error adding stock: {e}", severity="error")
+
+        self.dismiss()
+
+    def on_key(self, event) -> None:
+        """Handle escape key"""
+        if event.key == "escape":
+            self.dismiss()
 
 
 class DashboardScreen(Screen):
@@ -150,24 +268,40 @@ class DashboardScreen(Screen):
     .neutral { color: $warning; }
     """
 
-    def __init__(self, game_state: GameState):
+    def __init__(self, game_state: "GameState"):
         super().__init__()
         self.game_state = game_state
         self.portfolio = game_state.portfolio
+        # Text and classes last applied to each top-bar metric card, so unchanged ones are skipped
+        self._last_texts = [None] * 5
+        self._last_classes = [None] * 5
+        # True while a coalesced post-advance refresh is scheduled
+        self._refresh_pending = False
+        # Symbol -> cell strings currently shown in the portfolio grid
+        self._row_cells: Dict[str, tuple] = {}
+        # ((created_at, current_day), simulated date) from the last _game_current_date call
+        self._cached_game_date = (None, None)
+        # In-flight coach analysis, so repeated presses don't queue more
+        self._coach_pending: Optional[asyncio.Task] = None
 
     def compose(self) -> ComposeResult:
         """Create professional trading terminal layout"""
         yield Header(show_clock=True)
 
-        # Top bar with key metrics
+        # Top bar with key metrics (one pass over positions)
+        portfolio = self.portfolio
+        positions_value, invested, unrealized = portfolio.snapshot()
+        total_pnl = portfolio.realized_pnl + unrealized
+        pnl_pct = (total_pnl / invested) * 100 if invested > 0 else 0.0
+        pnl_class = _pnl_class(total_pnl)
         with Horizontal(id="top-bar"):
-            yield Static(self._format_metric("Day", self.game_state.current_day), classes="metric-card")
-            yield Static(self._format_metric("Cash", self.portfolio.cash, prefix="₹"), classes="metric-card positive")
-            yield Static(self._format_metric("Portfolio", self.portfolio.total_value, prefix="₹"), classes="metric-card")
-            yield Static(self._format_metric("P&L", self.portfolio.total_pnl, prefix="₹", show_sign=True),
-                       classes=f"metric-card {self._pnl_class()}")
-            yield Static(self._format_metric("P&L %", self._calculate_pnl_pct(), suffix="%", show_sign=True),
-                       classes=f"metric-card {self._pnl_class()}")
+            yield Static(_format_metric("Day", self.game_state.current_day), classes="metric-card")
+            yield Static(_format_metric("Cash", portfolio.cash, prefix="₹"), classes="metric-card positive")
+            yield Static(_format_metric("Portfolio", portfolio.cash + positions_value, prefix="₹"), classes="metric-card")
+            yield Static(_format_metric("P&L", total_pnl, prefix="₹", show_sign=True),
+                       classes=f"metric-card {pnl_class}")
+            yield Static(_format_metric("P&L %", pnl_pct, suffix="%", show_sign=True),
+                       classes=f"metric-card {pnl_class}")
 
         # Market summary ticker (scrolling ticker of all positions)
         yield LiveTickerWidget(self.portfolio.positions, id="ticker-bar")
@@ -193,116 +327,116 @@ class DashboardScreen(Screen):
 
         yield Footer()
 
-    def _format_metric(self, label: str, value, prefix="", suffix="", show_sign=False) -> str:
-        """Format metric for display"""
-        if isinstance(value, float):
-            if show_sign:
-                sign = "+" if value >= 0 else ""
-                return f"{label}\n{sign}{prefix}{value:,.2f}{suffix}"
-            return f"{label}\n{prefix}{value:,.2f}{suffix}"
-        return f"{label}\n{prefix}{value}{suffix}"
-
-    def _pnl_class(self) -> str:
-        """Return CSS class based on P&L"""
-        pnl = self.portfolio.total_pnl
-        if pnl > 0:
-            return "positive"
-        elif pnl < 0:
-            return "negative"
-        return "neutral"
-
-    def _calculate_pnl_pct(self) -> float:
-        """Calculate P&L percentage"""
-        invested = self.portfolio.invested
-        if invested > 0:
-            return (self.portfolio.total_pnl / invested) * 100
-        return 0.0
-
     def on_mount(self) -> None:
         """Initialize screen"""
+        # Resolve the widgets touched on every refresh once, instead of a DOM query per use
+        self._chart = self.query_one("#main-chart", PortfolioChartWidget)
+        self._ticker = self.query_one("#ticker-bar", LiveTickerWidget)
+        self._watchlist = self.query_one("#watchlist", EnhancedWatchlistWidget)
+        self._portfolio_table = self.query_one("#portfolio-grid", DataTable)
+        self._top_bar = self.query_one("#top-bar")
+        self._metric_cards = tuple(self._top_bar.children)
+        self._coach_text = self.query_one("#coach-insights-text", Static)
+
         # Update portfolio grid with initial data
         self._populate_portfolio_grid()
 
         # Update chart with initial data
-        chart_widget = self.query_one("#main-chart", PortfolioChartWidget)
-        if chart_widget:
-            chart_widget.update_portfolio_history(self.game_state.portfolio_history)
+        self._chart.update_portfolio_history(self.game_state.portfolio_history)
 
         # Initialize watchlist with game state reference
-        try:
-            watchlist_widget = self.query_one("#watchlist", EnhancedWatchlistWidget)
-            watchlist_widget.game_state = self.game_state
-        except Exception:
-            pass
-
-    def _populate_portfolio_grid(self) -> None:
-        """Populate the portfolio DataTable with enhanced display"""
-        table = self.query_one("#portfolio-grid", DataTable)
-        table.clear(columns=True)
-
-        # Add columns
-        table.add_columns(
-            "Symbol",
-            "Quantity", 
-            "Avg Price",
-            "Current",
-            "Mkt Value",
-            "P&L ₹",
-            "P&L %",
-            "XIRR %",
-            "Days Held"
-        )
+        self._watchlist.game_state = self.game_state
+
+    def _game_current_date(self) -> date:
+        """Simulated calendar date of the current game day, rebuilt only when the day changes"""
+        key = (self.game_state.created_at, self.game_state.current_day)
+        cached_key, game_date = self._cached_game_date
+        if cached_key != key:
+            game_date = key[0].date() + timedelta(days=key[1])
+            self._cached_game_date = (key, game_date)
+        return game_date
+
+    def _populate_portfolio_grid(self, portfolio=None) -> None:
+        """Sync the portfolio DataTable with the positions, touching only cells that changed"""
+        portfolio = portfolio or self.portfolio
+        table = self._portfolio_table
+        if not table.columns:
+            # Columns are added once and kept across refreshes
+            for key, label in _GRID_COLUMNS:
+                table.add_column(label, key=key)
 
         # Check if portfolio positions exist and have the required attributes
-        if not hasattr(self.portfolio, 'positions'):
+        if not hasattr(portfolio, 'positions'):
             return
 
-        # Sort positions by P&L (descending)
+        # Sort positions by P&L (descending), reading each P&L once and reusing it for the row
+        positions = portfolio.positions
+        pnls = [getattr(p, 'unrealized_pnl', 0) for p in positions]
         try:
-            sorted_positions = sorted(
-                self.portfolio.positions,
-                key=lambda p: p.unrealized_pnl if hasattr(p, 'unrealized_pnl') else 0,
-                reverse=True
-            )
+            ranked = sorted(zip(pnls, positions), key=itemgetter(0), reverse=True)
         except TypeError:
-            # Fallback if positions don't have the attribute yet
-            sorted_positions = self.portfolio.positions
+            # Fallback if some P&L isn't comparable yet
+            ranked = list(zip(pnls, positions))
 
-        # Calculate game's current date for XIRR calculation
-        from datetime import timedelta
-        game_current_date = self.game_state.created_at.date() + timedelta(days=self.game_state.current_day)
+        # Game's current date for XIRR and holding periods, computed once per refresh
+        game_current_date = self._game_current_date()
+        xirr_by_symbol = portfolio.refresh_metrics(game_current_date)
 
-        for pos in sorted_positions:
-            # Calculate metrics
-            pnl = pos.unrealized_pnl if hasattr(pos, 'unrealized_pnl') else (pos.current_price - pos.avg_buy_price) * pos.quantity if hasattr(pos, 'avg_buy_price') else 0
-            pnl_pct = pos.unrealized_pnl_pct if hasattr(pos, 'unrealized_pnl_pct') else 0
+        row_cells = self._row_cells
+        rank = {}  # Symbol cell -> display position, for reordering rows in place
+        for pnl, pos in ranked:
+            # Calculate metrics - Position and EnhancedPosition share this schema
+            try:
+                pnl_pct = pos.unrealized_pnl_pct
+                avg_price = pos.avg_buy_price
+                market_value = pos.market_value
+            except AttributeError:
+                pnl, pnl_pct, avg_price, market_value = _fallback_metrics(pos)
             # Pass game's current date for proper XIRR calculation based on simulation time
-            xirr = pos.calculate_xirr(game_current_date) * 100 if hasattr(pos, 'calculate_xirr') else 0
-            days_held = self._calculate_days_held(pos)
+            xirr = xirr_by_symbol.get(pos.symbol, 0.0) * 100
+            days_held = self._calculate_days_held(pos, game_current_date)
 
             # Color code based on P&L
             pnl_color = "green" if pnl > 0 else "red" if pnl < 0 else "white"
 
-            # Add row with rich text formatting
-            table.add_row(
+            # Row cells with rich text formatting, in _GRID_COLUMNS order
+            cells = (
                 f"[bold cyan]{pos.symbol}[/]",
                 f"{pos.quantity}",
-                f"₹{pos.avg_buy_price:,.2f}" if hasattr(pos, 'avg_buy_price') else f"₹{pos.current_price:,.2f}",
+                f"₹{avg_price:,.2f}",
                 f"₹{pos.current_price:,.2f}",
-                f"₹{pos.market_value if hasattr(pos, 'market_value') else pos.quantity * pos.current_price:,.2f}",
+                f"₹{market_value:,.2f}",
                 f"[{pnl_color}]{pnl:+,.2f}[/]",
                 f"[{pnl_color}]{pnl_pct:+.2f}%[/]",
                 f"[{pnl_color}]{xirr:+.2f}%[/]",
                 f"{days_held}d"
             )
-
-    def _calculate_days_held(self, position) -> int:
+            previous = row_cells.get(pos.symbol)
+            if previous is None:
+                table.add_row(*cells, key=pos.symbol)
+            else:
+                for (column_key, _), old, new in zip(_GRID_COLUMNS, previous, cells):
+                    if old != new:
+                        table.update_cell(pos.symbol, column_key, new, update_width=True)
+            row_cells[pos.symbol] = cells
+            rank[cells[0]] = len(rank)
+
+        # Drop rows of positions that were sold out
+        held = {pos.symbol for _, pos in ranked}
+        for symbol in [symbol for symbol in row_cells if symbol not in held]:
+            table.remove_row(symbol)
+            del row_cells[symbol]
+
+        # Reorder rows only when the P&L ranking changed
+        if [row.key.value for row in table.ordered_rows] != [pos.symbol for _, pos in ranked]:
+            table.sort("symbol", key=rank.__getitem__)
+
+    def _calculate_days_held(self, position, game_current_date: date) -> int:
         """Calculate number of days this position has been held"""
         # If position has transaction history, calculate from first transaction
-        if hasattr(position, 'transactions') and position.transactions:
-            from datetime import timedelta
-            game_current_date = self.game_state.created_at.date() + timedelta(days=self.game_state.current_day)
-            first_transaction_date = position.transactions[0].date
+        transactions = getattr(position, 'transactions', None)
+        if transactions:
+            first_transaction_date = transactions[0].date
             days_held = (game_current_date - first_transaction_date).days
             return days_held
         # Fallback: assume held since game start
@@ -314,7 +448,7 @@ class DashboardScreen(Screen):
     
     def action_save(self) -> None:
         """Save game"""
-        asyncio.create_task(self.app._save_current_game())
+        self.app._request_save()
 
     def action_trade(self) -> None:
         """Open trade modal"""
@@ -341,8 +475,7 @@ class DashboardScreen(Screen):
             return
 
         # Calculate game's current date for transaction
-        from datetime import timedelta
-        game_current_date = self.game_state.created_at.date() + timedelta(days=self.game_state.current_day)
+        game_current_date = self._game_current_date()
 
         # Execute trade
         if action == "BUY":
@@ -368,7 +501,6 @@ class DashboardScreen(Screen):
             self._refresh_display()
 
             # Record trade in coach memory
-            from datetime import datetime
             trade_info = {
                 "action": action,
                 "symbol": symbol,
@@ -392,7 +524,7 @@ class DashboardScreen(Screen):
             self.app.notify(f"Coach: {feedback}", timeout=10)
 
             # Auto-save after trade
-            asyncio.create_task(self.app._save_current_game())
+            self.app._request_save()
         else:
             self.app.notify(result.message, severity="error")
 
@@ -408,131 +540,168 @@ class DashboardScreen(Screen):
             self.app.notify("Approaching maximum simulation days. Consider starting a new game.", severity="warning")
 
         self.game_state.current_day += 1
-
-        # Update prices for all positions
-        for position in self.game_state.portfolio.positions:
-            # For days beyond the original range, we'll use the market data loader's 
-            # extended functionality to simulate prices beyond historical data
-            try:
-                # Get price from N days ago
-                if self.game_state.current_day <= self.game_state.total_days:
-                    days_ago = self.game_state.total_days - self.game_state.current_day
-                    new_price = self.app.market_data.get_price_at_day(position.symbol, days_ago)
-                else:
-                    # Beyond original period, use extended simulation
-                    new_price = self.app.market_data.get_price_at_day_with_simulation(position.symbol)
-                
-                if new_price > 0:
-                    position.current_price = new_price
-            except Exception as e:
-                # Fallback to current price if historical lookup fails
-                self.app.notify(f"Price update issue for {position.symbol}: {str(e)}", severity="warning")
+        # Trades today are dated on the simulation clock, not the wall clock
+        set_simulation_date(self._game_current_date())
+
+        # Update prices for all positions with one batched market-data call
+        symbols = [position.symbol for position in self.game_state.portfolio.positions]
+        if self.game_state.current_day <= self.game_state.total_days:
+            # Get prices from N days ago
+            days_ago = self.game_state.total_days - self.game_state.current_day
+        else:
+            # Beyond original period, use extended simulation
+            days_ago = None
+        prices, failures = self.app.market_data.get_prices_at_day_safe(symbols, days_ago)
+        if failures:
+            # Symbols that failed keep their current price; report them once
+            logger.warning(f"Price update failed for {len(failures)} symbol(s): {failures}")
+            failed = ", ".join(symbol for symbol, _ in failures)
+            self.app.notify(f"Price update issues for {len(failures)} symbol(s): {failed}", severity="warning")
+        self.game_state.portfolio.update_prices(
+            {symbol: price for symbol, price in prices.items() if price > 0}
+        )
 
         # Record portfolio state for coach memory and charting
         self.game_state.record_portfolio_state()
         
-        # Add portfolio snapshot to coach memory
+        # Add portfolio snapshot to coach memory (reuses the state just recorded)
         portfolio_snapshot = {
-            "day": self.game_state.current_day,
-            "total_value": self.game_state.portfolio.total_value,
-            "cash": self.game_state.portfolio.cash,
-            "positions_value": self.game_state.portfolio.positions_value,
-            "pnl": self.game_state.portfolio.total_pnl,
+            **self.game_state.portfolio_history[-1],
             "num_positions": len(self.game_state.portfolio.positions)
         }
         self.app.coach.add_to_memory("portfolio_snapshot", portfolio_snapshot)
 
-        self._refresh_display()
-
-        # Update watchlist prices (CRITICAL: update game state reference first)
-        try:
-            watchlist_widget = self.query_one("#watchlist", EnhancedWatchlistWidget)
-            watchlist_widget.game_state = self.game_state  # Update reference
-            watchlist_widget.update_prices()  # Refresh chart with new day
-        except Exception as e:
-            # Log error for debugging but don't crash
-            import traceback
-            traceback.print_exc()
+        # Repaint once per burst of advances rather than once per keypress
+        self._schedule_refresh()
 
         self.app.notify(f"Advanced to day {self.game_state.current_day}")
 
-        # Auto-save
-        asyncio.create_task(self.app._save_current_game())
+        # Auto-save (coalesced by the app)
+        self.app._request_save()
+
+    def _schedule_refresh(self) -> None:
+        """Schedule a post-advance repaint; requests within REFRESH_DEBOUNCE_SECONDS share it"""
+        if not self._refresh_pending:
+            self._refresh_pending = True
+            self.set_timer(REFRESH_DEBOUNCE_SECONDS, self._flush_refresh)
+
+    async def _flush_refresh(self) -> None:
+        """Repaint the dashboard and watchlist for the latest simulated day"""
+        self._refresh_pending = False
+        # Solve the day's XIRRs in a worker thread; the grid then reads them from
+        # each position's XIRR cache instead of blocking the event loop.
+        # Inputs are snapshotted and results stored here on the loop - the worker only
+        # sees copied arrays, never positions that trades and price updates are mutating.
+        portfolio = self.portfolio
+        jobs = portfolio.pending_xirr_inputs(self._game_current_date())
+        if jobs:
+            results = await asyncio.to_thread(
+                lambda: [EnhancedPosition.solve_cash_flows(flows) for _, _, flows in jobs]
+            )
+            portfolio.store_xirr_results(jobs, results)
+        if not self.is_attached:
+            return  # Screen was dismissed while the worker ran
+        # One layout/paint pass for the whole day's updates
+        with self.app.batch_update():
+            self._refresh_display()
+
+            # Update watchlist prices (CRITICAL: update game state reference first)
+            try:
+                watchlist_widget = self._watchlist
+                watchlist_widget.game_state = self.game_state  # Update reference
+                watchlist_widget.update_prices()  # Refresh chart with new day
+            except Exception:
+                # Log error for debugging but don't crash; the traceback is only built at DEBUG level
+                logger.debug("Watchlist update failed", exc_info=True)
 
     def _refresh_display(self) -> None:
         """Refresh all displays with updated values and styling"""
+        # Widget updates below are coalesced into a single repaint
+        with self.app.batch_update():
+            self._update_widgets()
+
+    def _update_widgets(self) -> None:
+        """Push fresh values into the grid, chart, ticker and metric cards"""
         # CRITICAL: Always use fresh reference from game_state
         portfolio = self.game_state.portfolio
+        positions = portfolio.positions
 
         # Update portfolio grid
-        self._populate_portfolio_grid()
+        self._populate_portfolio_grid(portfolio)
 
         # Update chart
-        chart_widget = self.query_one("#main-chart", PortfolioChartWidget)
-        if chart_widget:
-            chart_widget.update_portfolio_history(self.game_state.portfolio_history)
+        self._chart.update_portfolio_history(self.game_state.portfolio_history)
 
-        # Update ticker with latest positions
-        ticker_widget = self.query_one("#ticker-bar", LiveTickerWidget)
-        if ticker_widget and hasattr(ticker_widget, 'update_positions'):
-            ticker_widget.update_positions(portfolio.positions)
+        # Update ticker; its per-symbol segment cache re-formats only positions that moved
+        self._ticker.update_positions(positions)
 
         # Update summary cards individually with fresh values and CSS classes
-        top_bar = self.query_one("#top-bar")
-        children_list = list(top_bar.children)
 
-        # Calculate fresh values
-        current_pnl = portfolio.total_pnl
-        current_total_value = portfolio.total_value
+        # Calculate fresh values (one pass over positions)
+        positions_value, invested, unrealized = portfolio.snapshot()
+        current_pnl = portfolio.realized_pnl + unrealized
+        current_total_value = portfolio.cash + positions_value
         current_cash = portfolio.cash
-        current_pnl_pct = (current_pnl / portfolio.invested) * 100 if portfolio.invested > 0 else 0.0
-        pnl_class = "positive" if current_pnl > 0 else "negative" if current_pnl < 0 else "neutral"
-
-        for i, child in enumerate(children_list):
-            if i == 0:  # Day
-                child.update(self._format_metric("Day", self.game_state.current_day))
-                child.set_classes("metric-card")
-            elif i == 1:  # Cash
-                child.update(self._format_metric("Cash", current_cash, prefix="₹"))
-                child.set_classes("metric-card positive")
-            elif i == 2:  # Total Value
-                child.update(self._format_metric("Portfolio", current_total_value, prefix="₹"))
-                child.set_classes("metric-card")
-            elif i == 3:  # P&L ₹
-                child.update(self._format_metric("P&L", current_pnl, prefix="₹", show_sign=True))
-                child.set_classes(f"metric-card {pnl_class}")
-            elif i == 4:  # P&L %
-                child.update(self._format_metric("P&L %", current_pnl_pct, suffix="%", show_sign=True))
-                child.set_classes(f"metric-card {pnl_class}")
-        
+        current_pnl_pct = (current_pnl / invested) * 100 if invested > 0 else 0.0
+        pnl_class = _pnl_class(round(current_pnl, 2))
+
+        # Day
+        self._set_card(0, _format_metric("Day", self.game_state.current_day), "metric-card")
+        # Cash
+        self._set_card(1, _format_metric("Cash", current_cash, prefix="₹"), "metric-card positive")
+        # Total Value
+        self._set_card(2, _format_metric("Portfolio", current_total_value, prefix="₹"), "metric-card")
+        # P&L ₹
+        self._set_card(3, _format_metric("P&L", current_pnl, prefix="₹", show_sign=True), f"metric-card {pnl_class}")
+        # P&L %
+        self._set_card(4, _format_metric("P&L %", current_pnl_pct, suffix="%", show_sign=True), f"metric-card {pnl_class}")
+
+    def _set_card(self, index: int, text: str, classes: str) -> None:
+        """Update one top-bar metric card; text and classes are each skipped when unchanged"""
+        widget = self._metric_cards[index]
+        if self._last_texts[index] != text:
+            widget.update(text)
+            self._last_texts[index] = text
+        # set_classes restyles even for an identical class set
+        if self._last_classes[index] != classes:
+            widget.set_classes(classes)
+            self._last_classes[index] = classes
+
     def action_coach(self) -> None:
-        """Get portfolio insights from coach with enhanced trend analysis"""
+        """Get portfolio insights from coach; presses while an analysis runs are ignored"""
+        if self._coach_pending is not None and not self._coach_pending.done():
+            return  # The running analysis already covers this press
+        self._coach_pending = asyncio.create_task(self._run_coach_insights())
+
+    async def _run_coach_insights(self) -> None:
+        """Run the coach analysis in a worker thread and show the result"""
         portfolio = self.game_state.portfolio
-        cash_percentage = (portfolio.cash / portfolio.total_value) * 100 if portfolio.total_value > 0 else 100
+        positions_value, total_invested, unrealized = portfolio.snapshot()
+        total_value = portfolio.cash + positions_value
+        total_pnl = portfolio.realized_pnl + unrealized
+        cash_percentage = (portfolio.cash / total_value) * 100 if total_value > 0 else 100
         # Calculate total P&L percentage based on invested amount
-        total_invested = portfolio.invested
-        total_pnl_percentage = (portfolio.total_pnl / total_invested) * 100 if total_invested > 0 else 0
+        total_pnl_percentage = (total_pnl / total_invested) * 100 if total_invested > 0 else 0
+
+        # Use enhanced portfolio insights (may call the LLM, so keep it off the event loop)
+        coach = self.app.coach
+        insights = await asyncio.to_thread(coach.get_portfolio_trend_insights)
 
-        # Use enhanced portfolio insights
-        insights = self.app.coach.get_portfolio_trend_insights()
-        
         # If the enhanced insights are not available, fall back to basic analysis
         if not insights or "Not enough data" in insights:
-            insights = self.app.coach.get_portfolio_insights(
+            insights = await asyncio.to_thread(
+                coach.get_portfolio_insights,
                 num_positions=len(portfolio.positions),
-                total_value=portfolio.total_value,
+                total_value=total_value,
                 cash_percentage=cash_percentage,
                 total_pnl_percentage=total_pnl_percentage
             )
 
         # Update coach insights display (NO notification - insights show in the panel only)
-        coach_insights_widget = self.query_one("#coach-insights-text", Static)
-        if coach_insights_widget:
-            coach_insights_widget.update(insights)
+        self._coach_text.update(insights)
 
     def action_help(self) -> None:
         """Show help screen"""
-        from src.tui.screens.help_screen import HelpScreen
         self.app.push_screen(HelpScreen())
         
     def action_refresh(self) -> None:
@@ -541,7 +710,7 @@ class DashboardScreen(Screen):
 
     def action_chart_zoom_in(self) -> None:
         """Zoom in on portfolio chart (show fewer days, more detail)"""
-        chart_widget = self.query_one("#main-chart", PortfolioChartWidget)
+        chart_widget = self._chart
         if chart_widget:
             if chart_widget.zoom_in():
                 self.app.notify("📊 Chart zoomed in", severity="information", timeout=1)
@@ -550,14 +719,14 @@ class DashboardScreen(Screen):
 
     def action_chart_zoom_out(self) -> None:
         """Zoom out on portfolio chart (show more days, less detail)"""
-        chart_widget = self.query_one("#main-chart", PortfolioChartWidget)
+        chart_widget = self._chart
         if chart_widget:
             chart_widget.zoom_out()
             self.app.notify("📊 Chart zoomed out", severity="information", timeout=1)
 
     def action_chart_reset_zoom(self) -> None:
         """Reset chart zoom to show all data"""
-        chart_widget = self.query_one("#main-chart", PortfolioChartWidget)
+        chart_widget = self._chart
         if chart_widget:
             chart_widget.reset_zoom()
             self.app.notify("📊 Chart zoom reset to full view", severity="information", timeout=1)
@@ -567,82 +736,8 @@ class DashboardScreen(Screen):
         # Get available stocks
         stocks = self.app.market_data.get_default_stocks()
 
-        # Create a simple prompt to add stock
-        from textual.widgets import OptionList
-        from textual.widgets.option_list import Option
-        from textual.screen import ModalScreen
-        from textual.containers import Vertical as VerticalContainer
-        from textual.widgets import Label, Button
-
-        class AddStockModal(ModalScreen):
-            """Modal for adding stock to watchlist"""
-
-            CSS = """
-            AddStockModal {
-                align: center middle;
-            }
-
-            #add_stock_dialog {
-                width: 50;
-                height: auto;
-                max-height: 30;
-                background: $surface;
-                border: thick $primary;
-                padding: 1 2;
-            }
-
-            #stock_option_list {
-                height: 15;
-                margin: 1 0;
-                border: solid $accent;
-            }
-            """
-
-            def __init__(self, stocks, watchlist_widget):
-                super().__init__()
-                self.stocks = stocks
-                self.watchlist_widget = watchlist_widget
-
-            def compose(self) -> ComposeResult:
-                with VerticalContainer(id="add_stock_dialog"):
-                    yield Label("Select stock to add to watchlist:", id="modal_title")
-                    option_list = OptionList(id="stock_option_list")
-                    for stock in self.stocks:
-                        option_list.add_option(Option(stock, id=stock))
-                    yield option_list
-                    yield Label("Press Enter to add, Esc to cancel", id="modal_hint")
-
-            def on_option_list_option_selected(self, event: OptionList.OptionSelected) -> None:
-                """Add selected stock to watchlist"""
-                stock_symbol = event.option.id
-
-                # Add to watchlist by programmatically selecting it
-                try:
-                    selector = self.watchlist_widget.query_one("#stock-selector", SelectionList)
-
-                    # Find and toggle the selection
-                    for idx, option in enumerate(selector._options):
-                        if option.id == stock_symbol:
-                            # Check if already selected
-                            if stock_symbol not in self.watchlist_widget.selected_stocks:
-                                selector.select(idx)
-                                self.app.notify(f"✓ Added {stock_symbol} to watchlist", severity="information")
-                            else:
-                                self.app.notify(f"ℹ {stock_symbol} already in watchlist", severity="warning")
-                            break
-                except Exception as e:
-                    self.app.notify(f"Error adding stock: {e}", severity="error")
-
-                self.dismiss()
-
-            def on_key(self, event) -> None:
-                """Handle escape key"""
-                if event.key == "escape":
-                    self.dismiss()
-
         # Show the modal
         try:
-            watchlist_widget = self.query_one("#watchlist", EnhancedWatchlistWidget)
-            self.app.push_screen(AddStockModal(stocks, watchlist_widget))
+            self.app.push_screen(AddStockModal(stocks, self._watchlist))
         except Exception as e:
             self.app.notify(f"Failed to open stock selector: {e}", severity="error")
\ No newline at end of file
@@ -3,18 +3,9 @@ from textual.app import ComposeResult
 from textual.screen import ModalScreen
 from textual.widgets import Static, Footer
 from textual.containers import Container, VerticalScroll
+from textual.content import Content
 
-class HelpScreen(ModalScreen):
-    """Help and instructions"""
-
-    BINDINGS = [
-        ("escape", "close", "Close"),
-    ]
-
-    def compose(self) -> ComposeResult:
-        with Container():
-            with VerticalScroll():
-                yield Static("""
+_HELP_MARKUP = """
 # Artha - Help
 
 ## Objective
@@ -65,7 +56,22 @@ Learn stock market investing by managing a virtual portfolio over 30 days.
 - Learn key investing concepts
 
 Press ESC to close help.
-                """, id="help-text")
+"""
+
+# Parsed once at import; Content is immutable, so every HelpScreen can share it
+_HELP_CONTENT = Content.from_markup(_HELP_MARKUP)
+
+class HelpScreen(ModalScreen):
+    """Help and instructions"""
+
+    BINDINGS = [
+        ("escape", "close", "Close"),
+    ]
+
+    def compose(self) -> ComposeResult:
+        with Container():
+            with VerticalScroll():
+                yield Static(_HELP_CONTENT, id="help-text")
 
         yield Footer()
 
@@ -1,15 +1,18 @@
 """Main game screen"""
+import logging
 from textual.app import ComposeResult
 from textual.screen import Screen
 from textual.widgets import Header, Footer, Static
 from textual.containers import Container, Vertical
 from src.tui.widgets.portfolio_grid import PortfolioGrid
 from src.models import GameState
+from src.config import REFRESH_DEBOUNCE_SECONDS
 from src.tui.screens.trade_modal import TradeModal
-from src.engine.trade_executor import TradeExecutor
-from src.utils.xirr_calculator import TransactionType
-import asyncio
-from datetime import datetime
+from src.tui.screens.help_screen import HelpScreen
+from src.engine.trade_executor import TradeExecutor, set_simulation_date
+from datetime import datetime, date, timedelta
+
+logger = logging.getLogger(__name__)
 
 class MainScreen(Screen):
     """Main game screen with portfolio display"""
@@ -27,6 +30,11 @@ class MainScreen(Screen):
     def __init__(self, game_state: GameState):
         super().__init__()
         self.game_state = game_state
+        # True while a coalesced display refresh is scheduled
+        self._refresh_pending = False
+        # Status-bar parts that never change during a game, formatted once
+        self._status_prefix = f"[bold]{game_state.player_name}[/bold] | Day: "
+        self._status_day_total = f"/{game_state.total_days} | Cash: ₹"
 
     def compose(self) -> ComposeResult:
         """Create child widgets"""
@@ -34,13 +42,7 @@ class MainScreen(Screen):
 
         with Container():
             # Status bar
-            yield Static(
-                f"[bold]{self.game_state.player_name}[/bold] | "
-                f"Day: {self.game_state.current_day}/{self.game_state.total_days} | "
-                f"Cash: ₹{self.game_state.portfolio.cash:,.2f} | "
-                f"Total: ₹{self.game_state.portfolio.total_value:,.2f}",
-                id="status"
-            )
+            yield Static(self._status_text(), id="status")
 
             # Portfolio
             with Vertical():
@@ -51,8 +53,15 @@ class MainScreen(Screen):
 
     def on_mount(self) -> None:
         """Initialize screen"""
-        portfolio_grid = self.query_one(PortfolioGrid)
-        portfolio_grid.update_portfolio(self.game_state.portfolio)
+        set_simulation_date(self._game_current_date())
+        # Resolve the refreshed widgets once, instead of a DOM query per refresh
+        self._portfolio_grid = self.query_one(PortfolioGrid)
+        self._status = self.query_one("#status", Static)
+        self._portfolio_grid.update_portfolio(self.game_state.portfolio)
+
+    def _game_current_date(self) -> date:
+        """Simulation date for the current game day"""
+        return self.game_state.created_at.date() + timedelta(days=self.game_state.current_day)
 
     def action_quit(self) -> None:
         """Quit application"""
@@ -64,7 +73,7 @@ class MainScreen(Screen):
     
     def action_save(self) -> None:
         """Save game"""
-        asyncio.create_task(self.app._save_current_game())
+        self.app._request_save()
 
     def action_trade(self) -> None:
         """Open trade modal"""
@@ -135,7 +144,7 @@ class MainScreen(Screen):
             self.app.notify(f"Coach: {feedback}", timeout=10)
 
             # Auto-save after trade
-            asyncio.create_task(self.app._save_current_game())
+            self.app._request_save()
         else:
             self.app.notify(result.message, severity="error")
 
@@ -151,36 +160,33 @@ class MainScreen(Screen):
             self.app.notify("Approaching maximum simulation days. Consider starting a new game.", severity="warning")
 
         self.game_state.current_day += 1
-
-        # Update prices for all positions
-        for position in self.game_state.portfolio.positions:
-            # For days beyond the original range, we'll use the market data loader's 
-            # extended functionality to simulate prices beyond historical data
-            try:
-                # Get price from N days ago
-                if self.game_state.current_day <= self.game_state.total_days:
-                    days_ago = self.game_state.total_days - self.game_state.current_day
-                    new_price = self.app.market_data.get_price_at_day(position.symbol, days_ago)
-                else:
-                    # Beyond original period, use extended simulation
-                    new_price = self.app.market_data.get_price_at_day_with_simulation(position.symbol)
-                
-                if new_price > 0:
-                    position.current_price = new_price
-            except Exception as e:
-                # Fallback to current price if historical lookup fails
-                self.app.notify(f"Price update issue for {position.symbol}: {str(e)}", severity="warning")
+        # Trades today are dated on the simulation clock, not the wall clock
+        set_simulation_date(self._game_current_date())
+
+        # Update prices for all positions with one batched market-data call
+        symbols = [position.symbol for position in self.game_state.portfolio.positions]
+        if self.game_state.current_day <= self.game_state.total_days:
+            # Get prices from N days ago
+            days_ago = self.game_state.total_days - self.game_state.current_day
+        else:
+            # Beyond original period, use extended simulation
+            days_ago = None
+        prices, failures = self.app.market_data.get_prices_at_day_safe(symbols, days_ago)
+        if failures:
+            # Symbols that failed keep their current price; report them once
+            logger.warning(f"Price update failed for {len(failures)} symbol(s): {failures}")
+            failed = ", ".join(symbol for symbol, _ in failures)
+            self.app.notify(f"Price update issues for {len(failures)} symbol(s): {failed}", severity="warning")
+        self.game_state.portfolio.update_prices(
+            {symbol: price for symbol, price in prices.items() if price > 0}
+        )
 
         # Record portfolio state for coach memory and charting
         self.game_state.record_portfolio_state()
         
-        # Add portfolio snapshot to coach memory
+        # Add portfolio snapshot to coach memory (reuses the state just recorded)
         portfolio_snapshot = {
-            "day": self.game_state.current_day,
-            "total_value": self.game_state.portfolio.total_value,
-            "cash": self.game_state.portfolio.cash,
-            "positions_value": self.game_state.portfolio.positions_value,
-            "pnl": self.game_state.portfolio.total_pnl,
+            **self.game_state.portfolio_history[-1],
             "num_positions": len(self.game_state.portfolio.positions)
         }
         self.app.coach.add_to_memory("portfolio_snapshot", portfolio_snapshot)
@@ -189,29 +195,39 @@ class MainScreen(Screen):
         self.app.notify(f"Advanced to day {self.game_state.current_day}")
 
         # Auto-save
-        asyncio.create_task(self.app._save_current_game())
+        self.app._request_save()
 
     def _refresh_display(self) -> None:
-        """Refresh portfolio display"""
-        portfolio_grid = self.query_one(PortfolioGrid)
-        portfolio_grid.update_portfolio(self.game_state.portfolio)
+        """Schedule a portfolio display refresh; calls within REFRESH_DEBOUNCE_SECONDS share it"""
+        if not self._refresh_pending:
+            self._refresh_pending = True
+            self.set_timer(REFRESH_DEBOUNCE_SECONDS, self._do_refresh)
+
+    def _do_refresh(self) -> None:
+        """Redraw the portfolio grid and status bar"""
+        self._refresh_pending = False
+        self._portfolio_grid.update_portfolio(self.game_state.portfolio)
 
         # Update status bar
-        status = self.query_one("#status", Static)
-        status.update(
-            f"[bold]{self.game_state.player_name}[/bold] | "
-            f"Day: {self.game_state.current_day}/{self.game_state.total_days} | "
-            f"Cash: ₹{self.game_state.portfolio.cash:,.2f} | "
-            f"Total: ₹{self.game_state.portfolio.total_value:,.2f}"
+        self._status.update(self._status_text())
+
+    def _status_text(self) -> str:
+        """Status bar markup; only the day, cash and total are formatted per call"""
+        portfolio = self.game_state.portfolio
+        return (
+            f"{self._status_prefix}{self.game_state.current_day}{self._status_day_total}"
+            f"{portfolio.cash:,.2f} | Total: ₹{portfolio.total_value:,.2f}"
         )
         
     def action_coach(self) -> None:
         """Get portfolio insights from coach with enhanced trend analysis"""
         portfolio = self.game_state.portfolio
-        cash_percentage = (portfolio.cash / portfolio.total_value) * 100 if portfolio.total_value > 0 else 100
+        positions_value, total_invested, unrealized = portfolio.snapshot()
+        total_value = portfolio.cash + positions_value
+        total_pnl = portfolio.realized_pnl + unrealized
+        cash_percentage = (portfolio.cash / total_value) * 100 if total_value > 0 else 100
         # Calculate total P&L percentage based on invested amount
-        total_invested = portfolio.invested
-        total_pnl_percentage = (portfolio.total_pnl / total_invested) * 100 if total_invested > 0 else 0
+        total_pnl_percentage = (total_pnl / total_invested) * 100 if total_invested > 0 else 0
 
         # Use enhanced portfolio insights
         insights = self.app.coach.get_portfolio_trend_insights()
@@ -220,7 +236,7 @@ class MainScreen(Screen):
         if not insights or "Not enough data" in insights:
             insights = self.app.coach.get_portfolio_insights(
                 num_positions=len(portfolio.positions),
-                total_value=portfolio.total_value,
+                total_value=total_value,
                 cash_percentage=cash_percentage,
                 total_pnl_percentage=total_pnl_percentage
             )
@@ -229,5 +245,4 @@ class MainScreen(Screen):
 
     def action_help(self) -> None:
         """Show help screen"""
-        from src.tui.screens.help_screen import HelpScreen
         self.app.push_screen(HelpScreen())
\ No newline at end of file
@@ -29,11 +29,19 @@ class MenuScreen(Screen):
 
         yield Footer()
 
-    async def on_mount(self) -> None:
+    def on_mount(self) -> None:
         """Check for saved games"""
-        # Check if there's a saved game
+        # Run as a task: waiting on the database here would stall the menu's message queue
+        self._saved_game_probe = asyncio.create_task(self._check_saved_game())
+
+    async def _check_saved_game(self) -> None:
+        """Enable Continue if the default user has a saved game"""
         try:
-            async for session in get_session():
+            # Tables may still be being created by the app's init task
+            await self.app._db_ready.wait()
+            if self.app._db_error is not None:
+                return  # Already reported by the app; Continue stays disabled
+            async with get_session() as session:
                 user = await UserDAO.get_user_by_username(session, DEFAULT_USERNAME)
                 if user:
                     game = await GameDAO.get_latest_game(session, user.id)
@@ -47,13 +55,23 @@ class MenuScreen(Screen):
     def on_button_pressed(self, event: Button.Pressed) -> None:
         """Handle button clicks - UPDATED"""
         if event.button.id == "new-game":
-            self.app.game_state = self.app._create_mock_game()
-            self.app.push_screen("main")
+            async def new_game():
+                # Market data and the "main" screen come from the app's startup task
+                await self.app._game_ready.wait()
+                if self._startup_failed():
+                    return
+                self.app.game_state = self.app._create_mock_game()
+                self.app.push_screen("main")
+
+            asyncio.create_task(new_game())
         elif event.button.id == "continue":
             # Load saved game
             async def load_game():
                 loaded_state = await self.app._load_or_create_game()
                 if loaded_state:
+                    await self.app._game_ready.wait()
+                    if self._startup_failed():
+                        return
                     self.app.game_state = loaded_state
                     self.app.push_screen("main")
 
@@ -61,6 +79,16 @@ class MenuScreen(Screen):
         elif event.button.id == "quit-btn":
             self.app.exit()
 
+    def _startup_failed(self) -> bool:
+        """Tell the player the game can't open if the app's startup task failed"""
+        if self.app._bootstrap_error is None:
+            return False
+        self.notify(
+            f"Game unavailable - startup failed: {self.app._bootstrap_error}",
+            severity="error"
+        )
+        return True
+
     def action_quit(self) -> None:
         """Quit application"""
         self.app.exit()
\ No newline at end of file
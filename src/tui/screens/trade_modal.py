@@ -4,7 +4,7 @@ from textual.app import ComposeResult
 from textual.widgets import Input, Select, Button, Label, Static
 from textual.containers import Container, Vertical, Horizontal
 from textual.events import Key
-from src.engine.trade_executor import OrderSide
+from src.engine.trade_executor import OrderSide, TradeExecutor
 
 class TradeModal(ModalScreen[dict]):
     """Modal for executing trades"""
@@ -56,37 +56,43 @@ class TradeModal(ModalScreen[dict]):
                     yield Button("Execute", variant="success", id="execute-btn")
                     yield Button("Cancel", variant="error", id="cancel-btn")
 
+    def on_mount(self) -> None:
+        """Resolve the form widgets once, instead of a DOM query per keystroke or click"""
+        self._symbol_select = self.query_one("#symbol-select", Select)
+        self._action_select = self.query_one("#action-select", Select)
+        self._qty_input = self.query_one("#quantity-input", Input)
+        self._estimate = self.query_one("#estimate", Static)
+
     def on_button_pressed(self, event: Button.Pressed) -> None:
         """Handle button clicks"""
         if event.button.id == "execute-btn":
             # Get values
-            symbol_select = self.query_one("#symbol-select", Select)
-            action_select = self.query_one("#action-select", Select)
-            qty_input = self.query_one("#quantity-input", Input)
+            symbol_select = self._symbol_select
+            action_select = self._action_select
+            qty_input = self._qty_input
 
             if symbol_select.value == Select.BLANK:
-                self.query_one("#estimate", Static).update("[red]Please select a stock[/]")
+                self._estimate.update("[red]Please select a stock[/]")
                 return
 
             if action_select.value == Select.BLANK:
-                self.query_one("#estimate", Static).update("[red]Please select an action[/]")
+                self._estimate.update("[red]Please select an action[/]")
                 return
 
             if not qty_input.value or qty_input.value.strip() == "":
-                self.query_one("#estimate", Static).update("[red]Please enter quantity[/]")
+                self._estimate.update("[red]Please enter quantity[/]")
                 return
 
             try:
                 quantity = int(qty_input.value)
 
                 # Validate
-                from src.engine.trade_executor import TradeExecutor
                 valid, message = TradeExecutor.validate_trade_inputs(
                     symbol_select.value, quantity, 100.0
                 )
 
                 if not valid:
-                    self.query_one("#estimate", Static).update(f"[red]{message}[/]")
+                    self._estimate.update(f"[red]{message}[/]")
                     return
 
                 result = {
@@ -97,7 +103,7 @@ class TradeModal(ModalScreen[dict]):
                 self.dismiss(result)
 
             except ValueError:
-                self.query_one("#estimate", Static).update("[red]Invalid quantity[/]")
+                self._estimate.update("[red]Invalid quantity[/]")
         else:  # Cancel button
             self.dismiss(None)
 
@@ -114,9 +120,8 @@ class TradeModal(ModalScreen[dict]):
             if quantity <= 0:
                 return
 
-            estimate = self.query_one("#estimate", Static)
             # Get approximate price (this is just an estimate before actual trade)
-            estimate.update(f"Estimated cost: ~₹{quantity * 2000:,.2f} (example)")
+            self._estimate.update(f"Estimated cost: ~₹{quantity * 2000:,.2f} (example)")
         except ValueError:
             # Not a valid integer yet, ignore
             pass
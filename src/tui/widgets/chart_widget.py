@@ -16,7 +16,7 @@ class PortfolioChartWidget(Static):
     def __init__(self, portfolio_history: List[Dict] = None, title: str = "Portfolio", *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.chart_title = title
-        self.portfolio_history = portfolio_history or []
+        self.portfolio_history = list(portfolio_history) if portfolio_history else []  # Sliceable copy
         # Zoom state
         self.start_idx = 0
         self.end_idx = None  # None means show all data
@@ -257,14 +257,12 @@ class EnhancedPortfolioGrid(Static):
         separator = "-" * len(header)
         
         rows = [header, separator]
-        
+        # XIRR only exists for positions with transaction history
+        xirr_by_symbol = portfolio.refresh_metrics()
+
         for pos in portfolio.positions:
-            # Check if position supports XIRR calculation
-            if hasattr(pos, 'calculate_xirr'):
-                xirr_val = pos.calculate_xirr()
-                xirr_str = f"{xirr_val*100:.2f}%"
-            else:
-                xirr_str = "N/A"
+            xirr_val = xirr_by_symbol.get(pos.symbol)
+            xirr_str = f"{xirr_val*100:.2f}%" if xirr_val is not None else "N/A"
                 
             # Calculate P&L (use appropriate method based on position type)
             if hasattr(pos, 'unrealized_pnl'):
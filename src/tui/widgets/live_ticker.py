@@ -3,7 +3,7 @@ from textual.widgets import Static
 from textual import work
 from textual.reactive import reactive
 import asyncio
-from typing import List
+from typing import Dict, List
 from src.models import Position
 
 
@@ -15,6 +15,8 @@ class LiveTickerWidget(Static):
     def __init__(self, positions: List[Position], *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.positions = positions or []
+        # Symbol -> ((price, quantity, avg price), rendered segment), so unmoved positions are not re-formatted
+        self._segments: Dict[str, tuple] = {}
 
     def on_mount(self) -> None:
         """Start ticker animation"""
@@ -24,36 +26,59 @@ class LiveTickerWidget(Static):
     async def animate_ticker(self) -> None:
         """Animate scrolling ticker"""
         while True:
-            ticker_items = []
-            for pos in self.positions:
-                # Calculate P&L values with fallbacks for different position types
-                if hasattr(pos, 'unrealized_pnl'):
-                    pnl = pos.unrealized_pnl
-                else:
-                    pnl = (pos.current_price - pos.avg_buy_price) * pos.quantity if hasattr(pos, 'avg_buy_price') else 0
-                    
-                if hasattr(pos, 'unrealized_pnl_pct'):
-                    pnl_pct = pos.unrealized_pnl_pct
-                else:
-                    cost = pos.avg_buy_price * pos.quantity if hasattr(pos, 'avg_buy_price') else pos.current_price * pos.quantity
-                    pnl_pct = (pnl / cost) * 100 if cost > 0 else 0
-
-                color = "green" if pnl >= 0 else "red"
-
-                ticker_items.append(
-                    f"[bold cyan]{pos.symbol}[/]: ₹{pos.current_price:.2f} "
-                    f"[{color}]{pnl_pct:+.2f}%[/]"
-                )
-
-            if ticker_items:
-                ticker_text = "   📊   ".join(ticker_items) + "   📊   "
-            else:
-                ticker_text = "No positions yet. Make your first trade!   📊"
-
-            self.ticker_text = ticker_text
-
+            self._render_ticker()
             await asyncio.sleep(2)  # Update every 2 seconds
 
+    def update_positions(self, positions: List[Position]) -> None:
+        """Point the tape at positions and redraw it; only moved or new symbols are re-formatted"""
+        self.positions = positions or []
+        self._render_ticker()
+
+    def _render_ticker(self) -> None:
+        """Join the per-position segments, formatting only those that changed"""
+        ticker_items = [self._segment(pos) for pos in self.positions]
+        if len(self._segments) > len(ticker_items):
+            # Drop segments of symbols no longer held
+            held = {pos.symbol for pos in self.positions}
+            self._segments = {s: seg for s, seg in self._segments.items() if s in held}
+
+        if ticker_items:
+            ticker_text = "   📊   ".join(ticker_items) + "   📊   "
+        else:
+            ticker_text = "No positions yet. Make your first trade!   📊"
+
+        self.ticker_text = ticker_text
+
+    def _segment(self, pos) -> str:
+        """Cached ticker segment for a position, rebuilt when its price, size or cost changes"""
+        key = (pos.current_price, pos.quantity, pos.avg_buy_price)
+        cached = self._segments.get(pos.symbol)
+        if cached is None or cached[0] != key:
+            cached = self._segments[pos.symbol] = (key, self._format_segment(pos))
+        return cached[1]
+
+    @staticmethod
+    def _format_segment(pos) -> str:
+        """Format one position for the ticker tape"""
+        # Calculate P&L values with fallbacks for different position types
+        if hasattr(pos, 'unrealized_pnl'):
+            pnl = pos.unrealized_pnl
+        else:
+            pnl = (pos.current_price - pos.avg_buy_price) * pos.quantity if hasattr(pos, 'avg_buy_price') else 0
+
+        if hasattr(pos, 'unrealized_pnl_pct'):
+            pnl_pct = pos.unrealized_pnl_pct
+        else:
+            cost = pos.avg_buy_price * pos.quantity if hasattr(pos, 'avg_buy_price') else pos.current_price * pos.quantity
+            pnl_pct = (pnl / cost) * 100 if cost > 0 else 0
+
+        color = "green" if pnl >= 0 else "red"
+
+        return (
+            f"[bold cyan]{pos.symbol}[/]: ₹{pos.current_price:.2f} "
+            f"[{color}]{pnl_pct:+.2f}%[/]"
+        )
+
     def watch_ticker_text(self, new_text: str) -> None:
         """Update display"""
-        self.update(new_text)
\ No newline at end of file
+        self.update(new_text)
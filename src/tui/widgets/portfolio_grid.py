@@ -22,14 +22,23 @@ class PortfolioGrid(DataTable):
         """Update table with portfolio data"""
         self.clear()
 
-        for position in portfolio.positions:
-            pnl_color = "green" if position.unrealized_pnl > 0 else "red"
+        table = portfolio.position_table()
+        rows = zip(
+            table.symbol,
+            table.quantity.tolist(),
+            table.avg_buy_price.tolist(),
+            table.current_price.tolist(),
+            table.unrealized_pnl.tolist(),
+            table.unrealized_pnl_pct.tolist()
+        )
+        for symbol, quantity, avg_buy_price, current_price, pnl, pnl_pct in rows:
+            pnl_color = "green" if pnl > 0 else "red"
 
             self.add_row(
-                position.symbol,
-                str(position.quantity),
-                f"₹{position.avg_buy_price:,.2f}",
-                f"₹{position.current_price:,.2f}",
-                f"[{pnl_color}]₹{position.unrealized_pnl:,.2f}[/]",
-                f"[{pnl_color}]{position.unrealized_pnl_pct:+.2f}%[/]"
-            )
\ No newline at end of file
+                symbol,
+                str(quantity),
+                f"₹{avg_buy_price:,.2f}",
+                f"₹{current_price:,.2f}",
+                f"[{pnl_color}]₹{pnl:,.2f}[/]",
+                f"[{pnl_color}]{pnl_pct:+.2f}%[/]"
+            )
@@ -2,6 +2,19 @@
 import time
 from functools import wraps
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    # Optional dependency - fall back to plain Python with the same signature
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit"""
+        def decorator(func):
+            return func
+        return decorator
+
 def time_it(func):
     """Decorator to measure function execution time"""
     @wraps(func)
@@ -70,9 +70,20 @@ def xirr(cash_flows: List[Tuple[Union[datetime, date], float]], guess: float = 0
         amounts_list.append(amount)
 
     # Convert to numpy arrays
-    days = np.array(days_list)
-    amounts = np.array(amounts_list)
+    return xirr_from_days(np.array(days_list), np.array(amounts_list), guess)
 
+def xirr_from_days(days: np.ndarray, amounts: np.ndarray, guess: float = 0.1) -> float:
+    """
+    Solve XIRR for cash flows already given as day offsets from the first flow
+
+    Args:
+        days: Days since the earliest cash flow, in date order
+        amounts: Cash flow amounts aligned with days
+        guess: Initial guess for the XIRR rate
+
+    Returns:
+        XIRR as a decimal value, with the same capping and fallbacks as xirr()
+    """
     # Define the XIRR equation: sum of CF / (1 + rate)^(days/365.25) = 0
     def xirr_equation(rate):
         return np.sum(amounts / np.power(1 + rate, days / 365.25))
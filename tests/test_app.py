@@ -25,4 +25,152 @@ async def test_database_initialization():
     # Verify database file exists
     import os
     from src.config import DB_PATH
-    assert os.path.exists(DB_PATH)
\ No newline at end of file
+    assert os.path.exists(DB_PATH)
+    # Screens waiting on the database are released
+    assert app._db_ready.is_set()
+
+
+@pytest.mark.asyncio
+async def test_database_init_failure_releases_waiters():
+    """A failed init_db is recorded, and saves and loads return instead of waiting forever."""
+    from unittest.mock import AsyncMock, patch
+
+    app = ArthaApp()
+    with patch("src.tui.app.init_db", new=AsyncMock(side_effect=RuntimeError("database is locked"))), \
+            patch("src.tui.app.get_session") as get_session, \
+            patch.object(app, "notify") as notify:
+        await app._init_database()
+        assert app._db_ready.is_set()
+        assert isinstance(app._db_error, RuntimeError)
+
+        assert await asyncio.wait_for(app._load_or_create_game(), timeout=1) is None
+        await asyncio.wait_for(app._save_current_game(), timeout=1)
+    get_session.assert_not_called()
+    assert notify.call_count == 3  # init failure, then the load and the save
+
+@pytest.mark.asyncio
+async def test_user_lookup_is_cached():
+    """The default user is fetched from the database only once."""
+    from unittest.mock import AsyncMock, patch
+    from src.database import get_session
+
+    app = ArthaApp()
+    await app._init_database()
+    async with get_session() as session:
+        user = await app._get_user(session)
+        with patch("src.tui.app.UserDAO.get_or_create_user", new=AsyncMock()) as lookup:
+            assert await app._get_user(session) is user
+            lookup.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_bootstrap_builds_game_after_mount():
+    """Heavy setup is deferred from __init__ to the mount-time bootstrap task."""
+    app = ArthaApp()
+    assert app.game_state is None
+
+    await app._bootstrap()
+    assert app._game_ready.is_set()
+    assert app.game_state is not None
+    assert app.market_data is not None
+    # The dashboard is only built when first shown
+    assert callable(app._installed_screens["main"])
+
+
+@pytest.mark.asyncio
+async def test_bootstrap_failure_releases_waiters():
+    """A failed bootstrap is recorded and still sets _game_ready, so menu handlers don't hang."""
+    from unittest.mock import patch
+
+    app = ArthaApp()
+    with patch.object(app, "_create_mock_game", side_effect=RuntimeError("no prices")), \
+            patch.object(app, "notify") as notify:
+        await app._bootstrap()
+    assert app._game_ready.is_set()
+    assert isinstance(app._bootstrap_error, RuntimeError)
+    assert "main" not in app._installed_screens
+    notify.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_save_requests_are_coalesced():
+    """A burst of save requests results in a single write."""
+    from unittest.mock import AsyncMock, patch
+
+    app = ArthaApp()
+    with patch.object(app, "_save_current_game", new=AsyncMock()) as save:
+        for _ in range(10):
+            app._request_save()
+        await app._save_pending
+        save.assert_awaited_once()
+        assert app._save_pending is None
+
+
+
+@pytest.mark.asyncio
+async def test_saves_never_overlap():
+    """Requests made while a write is running queue exactly one follow-up write."""
+    from unittest.mock import patch
+
+    app = ArthaApp()
+    running = 0
+    overlaps = []
+    writes = 0
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def held_save():
+        nonlocal running, writes
+        running += 1
+        overlaps.append(running > 1)
+        started.set()
+        await release.wait()  # the first write stays open until the test releases it
+        running -= 1
+        writes += 1
+
+    with patch("src.tui.app.SAVE_DEBOUNCE_SECONDS", 0), \
+            patch.object(app, "_save_current_game", new=held_save):
+        app._request_save()
+        await started.wait()  # first write is in progress
+        for _ in range(5):
+            app._request_save()
+            await asyncio.sleep(0)
+        follow_up = app._save_pending
+        assert follow_up is not None
+        release.set()
+        await follow_up
+
+    assert not any(overlaps)
+    assert writes == 2
+
+@pytest.mark.asyncio
+async def test_save_skips_user_lookup_once_game_exists():
+    """Saves into an existing game row never resolve the user."""
+    from unittest.mock import AsyncMock, patch
+    from src.models import GameState, Portfolio
+
+    app = ArthaApp()
+    await app._init_database()
+    app.game_state = GameState(
+        player_name="Test", current_day=1, total_days=30,
+        initial_capital=1000000.0, portfolio=Portfolio(cash=1000000.0)
+    )
+    app.notify = lambda *args, **kwargs: None
+    await app._save_current_game()
+    assert app.current_game_id is not None
+
+    with patch.object(app, "_get_user", new=AsyncMock()) as get_user:
+        await app._save_current_game()
+        get_user.assert_not_called()
+
+
+def test_repeated_exceptions_are_reported_once():
+    """An exception storm produces a single notification."""
+    from unittest.mock import Mock
+
+    app = ArthaApp()
+    app.notify = Mock()
+    for _ in range(5):
+        app.on_exception(ValueError("boom"))
+    app.on_exception(KeyError("other"))
+    assert app.notify.call_count == 2
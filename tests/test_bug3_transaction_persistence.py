@@ -42,7 +42,7 @@ async def test_save_and_load_transactions():
     """
     await init_db()
 
-    async for session in get_session():
+    async with get_session() as session:
         # Create test user and game
         user = await UserDAO.get_or_create_user(
             session,
@@ -124,7 +124,7 @@ async def test_realized_pnl_persists():
     """Test that realized P&L is saved and loaded"""
     await init_db()
 
-    async for session in get_session():
+    async with get_session() as session:
         # Create user and game
         user = await UserDAO.get_or_create_user(
             session,
@@ -176,7 +176,7 @@ async def test_xirr_works_after_reload():
     """
     await init_db()
 
-    async for session in get_session():
+    async with get_session() as session:
         # Create user and game
         user = await UserDAO.get_or_create_user(
             session,
@@ -236,7 +236,7 @@ async def test_multiple_positions_transactions():
     """Test that multiple positions each keep their own transactions"""
     await init_db()
 
-    async for session in get_session():
+    async with get_session() as session:
         user = await UserDAO.get_or_create_user(session, username="test_multi", full_name="Multi Test")
         game = await GameDAO.create_game(session, user_id=user.id, name="Multi Test", initial_capital=200000, total_days=30)
 
@@ -217,10 +217,10 @@ class TestGSTCalculation:
         # Check if cost breakdown exists
         if hasattr(result, 'cost_breakdown'):
             breakdown = result.cost_breakdown
-            assert 'gst' in breakdown or 'GST' in breakdown, \
+            assert 'gst' in breakdown._fields, \
                 "❌ FAIL: Cost breakdown missing GST component"
 
-            gst = breakdown.get('gst', breakdown.get('GST', 0))
+            gst = breakdown.gst
             assert gst > 0, "GST should be > 0"
 
             # GST should be ~18% of (brokerage + exchange)
@@ -374,7 +374,7 @@ class TestCostTransparency:
             # Check for key components
             required_fields = ['brokerage', 'exchange_charges', 'gst']
             for field in required_fields:
-                assert field in breakdown or field.replace('_', '') in breakdown, \
+                assert field in breakdown._fields, \
                     f"❌ FAIL: Cost breakdown missing '{field}'"
 
             print(f"✓ Cost breakdown available: {breakdown}")
@@ -13,7 +13,7 @@ async def test_database_operations():
     # Initialize database
     await init_db()
     
-    async for session in get_session():
+    async with get_session() as session:
         # Test user creation/get
         user = await UserDAO.get_or_create_user(
             session, 
@@ -47,4 +47,207 @@ async def test_database_operations():
         # Test game loading with positions
         loaded_game = await GameDAO.get_game(session, game.id)
         assert len(loaded_game.positions) == 1
-        assert loaded_game.positions[0].symbol == "RELIANCE"
\ No newline at end of file
+        assert loaded_game.positions[0].symbol == "RELIANCE"
+
+
+@pytest.mark.asyncio
+async def test_save_positions_removes_sold_positions():
+    """Positions missing from the portfolio are deleted on save."""
+    await init_db()
+
+    async with get_session() as session:
+        user = await UserDAO.get_or_create_user(session, username=DEFAULT_USERNAME)
+        game = await GameDAO.create_game(
+            session,
+            user_id=user.id,
+            name="Stale Position Game",
+            initial_capital=1000000.0,
+            total_days=30
+        )
+
+        positions = [
+            PositionModel(symbol="RELIANCE", quantity=50, avg_buy_price=2450.00, current_price=2520.00),
+            PositionModel(symbol="TCS", quantity=10, avg_buy_price=3500.00, current_price=3550.00),
+            PositionModel(symbol="INFY", quantity=20, avg_buy_price=1500.00, current_price=1490.00),
+        ]
+        await GameDAO.save_positions(session, game.id, positions)
+
+        # Sell out of TCS and INFY, update RELIANCE
+        positions = [
+            PositionModel(symbol="RELIANCE", quantity=60, avg_buy_price=2460.00, current_price=2530.00),
+        ]
+        await GameDAO.save_positions(session, game.id, positions)
+
+        game_id = game.id
+        session.expire_all()
+        loaded_game = await GameDAO.get_game(session, game_id)
+        assert [p.symbol for p in loaded_game.positions] == ["RELIANCE"]
+        assert loaded_game.positions[0].quantity == 60
+
+
+@pytest.mark.asyncio
+async def test_save_positions_upserts_and_clears():
+    """Re-saving updates rows in place; saving no positions clears the game."""
+    await init_db()
+
+    async with get_session() as session:
+        user = await UserDAO.get_or_create_user(session, username=DEFAULT_USERNAME)
+        game = await GameDAO.create_game(
+            session,
+            user_id=user.id,
+            name="Upsert Game",
+            initial_capital=1000000.0,
+            total_days=30
+        )
+        game_id = game.id
+
+        positions = [PositionModel(symbol="TCS", quantity=10, avg_buy_price=3500.00, current_price=3550.00)]
+        await GameDAO.save_positions(session, game_id, positions)
+        positions[0].quantity = 15
+        await GameDAO.save_positions(session, game_id, positions)
+
+        session.expire_all()
+        loaded_game = await GameDAO.get_game(session, game_id)
+        assert [(p.symbol, p.quantity) for p in loaded_game.positions] == [("TCS", 15)]
+
+        await GameDAO.save_positions(session, game_id, [])
+        session.expire_all()
+        loaded_game = await GameDAO.get_game(session, game_id)
+        assert loaded_game.positions == []
+
+
+@pytest.mark.asyncio
+async def test_save_game_state_and_positions_share_one_commit():
+    """With commit=False, game state and positions land together on a single commit."""
+    await init_db()
+
+    async with get_session() as session:
+        user = await UserDAO.get_or_create_user(session, username=DEFAULT_USERNAME)
+        game = await GameDAO.create_game(
+            session,
+            user_id=user.id,
+            name="Batched Save Game",
+            initial_capital=1000000.0,
+            total_days=30
+        )
+        game_id = game.id
+
+        positions = [PositionModel(symbol="INFY", quantity=20, avg_buy_price=1500.00, current_price=1490.00)]
+        await GameDAO.save_game_state(session, game_id, 970000.0, 3, commit=False)
+        await GameDAO.save_positions(session, game_id, positions, commit=False)
+        await session.commit()
+
+        session.expire_all()
+        loaded_game = await GameDAO.get_game(session, game_id)
+        assert loaded_game.current_cash == 970000.0
+        assert loaded_game.current_day == 3
+        assert [p.symbol for p in loaded_game.positions] == ["INFY"]
+
+
+@pytest.mark.asyncio
+async def test_prewarm_pool_fills_pool():
+    """prewarm_pool leaves the requested connections idle in the pool."""
+    from src.database import prewarm_pool
+    from src.database.connection import engine
+
+    await prewarm_pool(3)
+    assert engine.pool.checkedin() >= 3
+
+
+@pytest.mark.asyncio
+async def test_save_positions_statement_count_is_constant():
+    """save_positions costs the same number of statements for 1 or many positions."""
+    from sqlalchemy import event
+    from src.database.connection import engine
+
+    await init_db()
+
+    async with get_session() as session:
+        user = await UserDAO.get_or_create_user(session, username=DEFAULT_USERNAME)
+        game = await GameDAO.create_game(
+            session,
+            user_id=user.id,
+            name="Bulk Save Game",
+            initial_capital=1000000.0,
+            total_days=30
+        )
+
+        statements = []
+
+        def count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine.sync_engine, "before_cursor_execute", count)
+        try:
+            await GameDAO.save_positions(session, game.id, [
+                PositionModel(symbol="TCS", quantity=1, avg_buy_price=1.0, current_price=1.0)
+            ])
+            single = len(statements)
+            statements.clear()
+            await GameDAO.save_positions(session, game.id, [
+                PositionModel(symbol=f"SYM{i}", quantity=i + 1, avg_buy_price=1.0, current_price=1.0)
+                for i in range(25)
+            ])
+            assert len(statements) == single
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", count)
+
+
+@pytest.mark.asyncio
+async def test_sqlite_connections_use_wal():
+    """Pooled SQLite connections run in WAL mode with synchronous=NORMAL."""
+    from sqlalchemy import text
+    from src.database.connection import engine
+
+    if engine.dialect.name != "sqlite":
+        pytest.skip("SQLite-only PRAGMAs")
+    async with engine.connect() as conn:
+        assert (await conn.execute(text("PRAGMA journal_mode"))).scalar() == "wal"
+        assert (await conn.execute(text("PRAGMA synchronous"))).scalar() == 1  # NORMAL
+
+
+@pytest.mark.asyncio
+async def test_get_user_and_latest_game():
+    """The joined lookup returns the user's newest game, or creates the user."""
+    await init_db()
+
+    async with get_session() as session:
+        user, _ = await UserDAO.get_user_and_latest_game(session, DEFAULT_USERNAME)
+        game = await GameDAO.create_game(
+            session,
+            user_id=user.id,
+            name="Newest Game",
+            initial_capital=1000000.0,
+            total_days=30
+        )
+        await GameDAO.save_positions(session, game.id, [
+            PositionModel(symbol="TCS", quantity=10, avg_buy_price=3500.00, current_price=3550.00)
+        ])
+        session.expire_all()
+
+        found_user, latest = await UserDAO.get_user_and_latest_game(session, DEFAULT_USERNAME)
+        assert found_user.id == user.id
+        assert latest.id == game.id
+        assert [p.symbol for p in latest.positions] == ["TCS"]
+
+        new_user, no_game = await UserDAO.get_user_and_latest_game(session, "joined-lookup-user")
+        assert new_user.username == "joined-lookup-user"
+        assert no_game is None
+
+
+@pytest.mark.asyncio
+async def test_init_db_adds_indexes_to_existing_tables():
+    """init_db backfills indexes on tables created before the indexes were declared."""
+    from sqlalchemy import inspect, text
+    from src.database.connection import engine
+
+    await init_db()
+    async with engine.begin() as conn:
+        await conn.execute(text("DROP INDEX ix_positions_game_id"))
+
+    await init_db()
+    async with engine.connect() as conn:
+        names = await conn.run_sync(
+            lambda sync_conn: {index["name"] for index in inspect(sync_conn).get_indexes("positions")}
+        )
+    assert "ix_positions_game_id" in names
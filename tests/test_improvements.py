@@ -541,4 +541,36 @@ def test_memory_management_in_coach():
     
     # Verify memory limits are enforced (portfolio_history should be limited)
     assert len(coach.memory.portfolio_history) <= 300  # 300 is the limit
-    assert len(coach.memory.trade_history) <= 100      # 100 is the limit
\ No newline at end of file
+    assert len(coach.memory.trade_history) <= 100      # 100 is the limit
+
+
+def test_dashboard_metric_format_is_memoized():
+    """Metric card text is cached, and int/float values of equal magnitude stay distinct"""
+    from src.tui.screens.dashboard_screen import _format_metric
+
+    assert _format_metric("Cash", 1000.0, prefix="₹") == "Cash\n₹1,000.00"
+    assert _format_metric("Cash", 1000, prefix="₹") == "Cash\n₹1000"
+    hits = _format_metric.cache_info().hits
+    _format_metric("Cash", 1000.0, prefix="₹")
+    assert _format_metric.cache_info().hits == hits + 1
+
+
+def test_live_ticker_reformats_only_moved_positions():
+    """Ticker segments are cached per symbol and rebuilt when price, size or cost changes"""
+    from src.tui.widgets.live_ticker import LiveTickerWidget
+
+    reliance = Position(symbol="RELIANCE", quantity=10, avg_buy_price=2400.0, current_price=2500.0)
+    tcs = Position(symbol="TCS", quantity=5, avg_buy_price=3500.0, current_price=3400.0)
+    ticker = LiveTickerWidget([reliance, tcs])
+
+    with patch.object(LiveTickerWidget, "_format_segment", wraps=LiveTickerWidget._format_segment) as fmt:
+        first = [ticker._segment(pos) for pos in (reliance, tcs)]
+        assert fmt.call_count == 2
+        reliance.current_price = 2600.0
+        second = [ticker._segment(pos) for pos in (reliance, tcs)]
+        assert fmt.call_count == 3
+        tcs.avg_buy_price = 3300.0
+        ticker._segment(tcs)
+        assert fmt.call_count == 4
+    assert second[1] is first[1]
+    assert "₹2600.00" in second[0]
@@ -33,4 +33,69 @@ def test_real_data_download():
         # This will be None if network is not available or if yfinance fails
         if data is not None:
             assert not data.empty
-            assert 'Close' in data.columns
\ No newline at end of file
+            assert 'Close' in data.columns
+
+def test_shared_loader_is_process_wide():
+    """get_shared_loader returns the same instance on every call."""
+    from src.data import get_shared_loader
+    assert get_shared_loader() is get_shared_loader()
+
+
+def test_price_lookups_are_memoized():
+    """Repeated historical lookups are served from the in-memory cache."""
+    loader = MarketDataLoader()
+    loader._price_cache[("RELIANCE", 3, 2000)] = 1234.5
+    loader._price_cache[("RELIANCE", None, 365)] = 2345.5
+    assert loader.get_price_at_day("RELIANCE", 3) == 1234.5
+    assert loader.get_current_price("RELIANCE") == 2345.5
+
+
+def test_get_prices_bulk_matches_single_lookups():
+    """Bulk offsets pick the same closes as get_price_at_day."""
+    import pandas as pd
+    from unittest.mock import patch
+
+    loader = MarketDataLoader()
+    frame = pd.DataFrame({"Close": [100.0, 101.0, 102.0, 103.0, 104.0, 105.0, 106.0]})
+    with patch.object(loader, "get_stock_data", return_value=frame):
+        prices = loader.get_prices_bulk(["RELIANCE", "TCS"], [0, 5])
+        assert prices == {"RELIANCE": [106.0, 101.0], "TCS": [106.0, 101.0]}
+        assert loader.get_price_at_day("RELIANCE", 5) == 101.0
+
+
+def test_get_prices_at_day_safe_serves_all_symbols():
+    """One call prices every symbol, reading memoized closes before the DataFrame."""
+    import pandas as pd
+    from unittest.mock import patch
+
+    loader = MarketDataLoader()
+    loader._price_cache[("TCS", 2, 2000)] = 3500.0
+    frame = pd.DataFrame({"Close": [100.0, 101.0, 102.0, 103.0]})
+    with patch.object(loader, "get_stock_data", return_value=frame) as fetch:
+        assert loader.get_prices_at_day_safe(["RELIANCE", "TCS"], 2) == (
+            {"RELIANCE": 101.0, "TCS": 3500.0}, []
+        )
+        assert [call.args[0] for call in fetch.call_args_list] == ["RELIANCE"]
+
+
+def test_get_prices_at_day_safe_reports_failures():
+    """A symbol whose lookup raises is listed in failures while the rest are priced."""
+    from unittest.mock import patch
+
+    loader = MarketDataLoader()
+    loader._price_cache[("TCS", 2, 2000)] = 3500.0
+    with patch.object(loader, "get_price_at_day", side_effect=RuntimeError("no data")):
+        prices, failures = loader.get_prices_at_day_safe(["TCS", "INFY"], 2)
+    assert prices == {"TCS": 3500.0}
+    assert failures == [("INFY", "no data")]
+
+
+def test_preload_stocks_loads_every_symbol():
+    """Preloading fetches each requested symbol once."""
+    from unittest.mock import patch
+
+    loader = MarketDataLoader()
+    symbols = ["RELIANCE", "TCS", "INFY"]
+    with patch.object(loader, "get_stock_data") as fetch:
+        loader.preload_stocks(symbols)
+        assert sorted(call.args[0] for call in fetch.call_args_list) == sorted(symbols)
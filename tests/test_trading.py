@@ -260,4 +260,244 @@ def test_enhanced_position_current_price_update():
         f"P&L should update to ₹{expected_pnl:,.2f}, got ₹{updated_pnl:,.2f}"
 
     print(f"✓ After 2nd price change: Price=₹{position.current_price}, MV=₹{position.market_value:,.2f}, P&L=₹{position.unrealized_pnl:,.2f}")
-    print(f"✓ Bug fix verified: market_value and unrealized_pnl now update when current_price changes!")
\ No newline at end of file
+    print(f"✓ Bug fix verified: market_value and unrealized_pnl now update when current_price changes!")
+
+def test_position_lookup_after_selling_out():
+    """Symbol lookup stays correct after a position in the middle is closed"""
+    portfolio = Portfolio(cash=200000, positions=[])
+    for symbol in ("RELIANCE", "TCS", "INFY"):
+        assert TradeExecutor.execute_buy(portfolio, symbol, 10, 1000.0).success
+
+    # Sell out of TCS - INFY shifts down one slot
+    assert TradeExecutor.execute_sell(portfolio, "TCS", 10, 1000.0).success
+    assert [p.symbol for p in portfolio.positions] == ["RELIANCE", "INFY"]
+
+    idx, pos = portfolio.find_position("INFY")
+    assert idx == 1 and pos.symbol == "INFY"
+    assert portfolio.find_position("TCS") == (-1, None)
+
+    # Direct list mutation is picked up on the next lookup
+    portfolio.positions.append(Position(symbol="ITC", quantity=5, avg_buy_price=400.0, current_price=410.0))
+    idx, pos = portfolio.find_position("ITC")
+    assert idx == 2 and pos.quantity == 5
+
+
+def test_position_lookup_after_positions_replaced():
+    """Reassigning positions, or swapping one at the same length, never hides a held symbol"""
+    portfolio = Portfolio(cash=100000.0, positions=[Position('INFY', 1, 1.0, 1.0)])
+    portfolio.positions = [Position('TCS', 10, 3000.0, 3000.0)]
+    assert TradeExecutor.execute_sell(portfolio, 'TCS', 5, 3100.0).success
+    assert portfolio.find_position('INFY') == (-1, None)
+
+    # Remove plus append keeps the length the same
+    portfolio.positions.pop()
+    portfolio.positions.append(Position('WIPRO', 20, 450.0, 450.0))
+    portfolio.update_prices({'WIPRO': 460.0})
+    assert portfolio.positions[0].current_price == 460.0
+    assert TradeExecutor.execute_buy(portfolio, 'WIPRO', 5, 460.0).success
+    assert [p.symbol for p in portfolio.positions] == ['WIPRO']
+
+
+def test_execute_batch_matches_sequential_trades():
+    """Batch replay gives the same results as executing trades one by one"""
+    import numpy as np
+    from datetime import date
+
+    symbols = np.array(["TCS", "INFY", "TCS", "TCS", "INFY", "WIPRO"])
+    quantities = np.array([10, 5, 4, 0, 5, 1])
+    prices = np.array([3500.0, 1500.0, 3600.0, 3600.0, 1510.0, 450.0])
+    is_buy = np.array([True, True, False, False, False, False])
+    dates = np.array(["2024-01-01", "2024-01-01", "2024-01-02", "2024-01-02", "2024-01-03", "2024-01-03"],
+                     dtype="datetime64[D]")
+
+    batch_portfolio = Portfolio(cash=1000000.0, positions=[])
+    batch_results = TradeExecutor.execute_batch(batch_portfolio, symbols, quantities, prices, is_buy, dates)
+
+    seq_portfolio = Portfolio(cash=1000000.0, positions=[])
+    seq_results = []
+    for symbol, qty, price, buy, day in zip(symbols, quantities, prices, is_buy, dates.tolist()):
+        execute = TradeExecutor.execute_buy if buy else TradeExecutor.execute_sell
+        seq_results.append(execute(seq_portfolio, str(symbol), int(qty), float(price), day))
+
+    assert [r.success for r in batch_results] == [True, True, True, False, True, False]
+    for batch, seq in zip(batch_results, seq_results):
+        assert batch.message == seq.message
+        assert batch.commission == pytest.approx(seq.commission)
+        assert batch.cost_breakdown == seq.cost_breakdown
+    assert batch_portfolio.cash == pytest.approx(seq_portfolio.cash)
+    assert batch_portfolio.realized_pnl == pytest.approx(seq_portfolio.realized_pnl)
+    assert batch_portfolio.positions[0].transactions[0].date == date(2024, 1, 1)
+
+
+def test_portfolio_update_prices():
+    """update_prices sets prices for held symbols and ignores the rest"""
+    portfolio = Portfolio(cash=100000.0, positions=[])
+    TradeExecutor.execute_buy(portfolio, "TCS", 10, 3500.0)
+    TradeExecutor.execute_buy(portfolio, "INFY", 5, 1500.0)
+
+    portfolio.update_prices({"TCS": 3600.0, "INFY": 1400.0, "WIPRO": 450.0})
+
+    assert portfolio.positions_value == pytest.approx(10 * 3600.0 + 5 * 1400.0)
+    assert portfolio.find_position("WIPRO") == (-1, None)
+
+
+def test_portfolio_snapshot_matches_properties():
+    """snapshot() agrees with the individual aggregate properties"""
+    portfolio = Portfolio(cash=100000.0, positions=[])
+    TradeExecutor.execute_buy(portfolio, "TCS", 10, 3500.0)
+    TradeExecutor.execute_buy(portfolio, "INFY", 20, 1500.0)
+    TradeExecutor.execute_sell(portfolio, "INFY", 5, 1550.0)
+    portfolio.update_prices({"TCS": 3600.0, "INFY": 1450.0})
+
+    positions_value, invested, unrealized = portfolio.snapshot()
+
+    assert positions_value == pytest.approx(portfolio.positions_value)
+    assert invested == pytest.approx(portfolio.invested)
+    assert portfolio.realized_pnl + unrealized == pytest.approx(portfolio.total_pnl)
+
+
+def test_enhanced_position_incremental_matches_recalculation():
+    """Metrics folded in per transaction equal a full recompute of the history"""
+    from datetime import date
+    from src.models import EnhancedPosition, PositionTransaction
+    from src.utils.xirr_calculator import TransactionType
+
+    position = EnhancedPosition(symbol="TCS", current_price=3600.0)
+    for qty, price, kind in [(10, 3500.0, TransactionType.BUY), (4, 3550.0, TransactionType.SELL),
+                             (6, 3450.0, TransactionType.BUY), (5, 3600.0, TransactionType.SELL)]:
+        position.add_transaction(PositionTransaction(date(2024, 1, 1), qty, price, kind, commission=12.5))
+
+    rebuilt = EnhancedPosition(symbol="TCS", current_price=3600.0, transactions=list(position.transactions))
+
+    assert position.quantity == rebuilt.quantity == 7
+    assert position.cost_basis == pytest.approx(rebuilt.cost_basis)
+    assert position.avg_buy_price == pytest.approx(rebuilt.avg_buy_price)
+    assert position.market_value == pytest.approx(rebuilt.market_value)
+
+
+def test_fifo_sells_after_new_transactions():
+    """FIFO matches stay correct when transactions are added after a cached call"""
+    from datetime import date
+    from src.models import EnhancedPosition, PositionTransaction
+    from src.utils.xirr_calculator import TransactionType
+
+    trades = [(10, 100.0, TransactionType.BUY), (5, 110.0, TransactionType.BUY),
+              (12, 120.0, TransactionType.SELL), (4, 105.0, TransactionType.BUY),
+              (6, 130.0, TransactionType.SELL)]
+
+    position = EnhancedPosition(symbol="TCS", current_price=100.0)
+    for qty, price, kind in trades[:3]:
+        position.add_transaction(PositionTransaction(date(2024, 1, 1), qty, price, kind))
+    assert len(position.get_fifo_sells()) == 2
+    for qty, price, kind in trades[3:]:
+        position.add_transaction(PositionTransaction(date(2024, 1, 2), qty, price, kind))
+
+    fresh = EnhancedPosition(symbol="TCS", current_price=100.0, transactions=list(position.transactions))
+    assert position.get_fifo_sells() == fresh.get_fifo_sells()
+    assert [r['quantity'] for r in fresh.get_fifo_sells()] == [10, 2, 3, 3]
+
+
+def test_calculate_pnl_all_buys_matches_per_transaction():
+    """Vectorized buy P&L agrees with the per-transaction API and tracks price updates"""
+    from datetime import date
+    from src.models import EnhancedPosition, PositionTransaction
+    from src.utils.xirr_calculator import TransactionType
+
+    position = EnhancedPosition(symbol="TCS", current_price=120.0)
+    position.add_transaction(PositionTransaction(date(2024, 1, 1), 10, 100.0, TransactionType.BUY))
+    position.add_transaction(PositionTransaction(date(2024, 1, 2), 4, 110.0, TransactionType.SELL))
+    position.add_transaction(PositionTransaction(date(2024, 1, 3), 5, 105.0, TransactionType.BUY))
+
+    assert position.calculate_pnl_all_buys().tolist() == [200.0, 75.0]
+    assert position.calculate_pnl_for_transaction(1) == 0.0
+
+    position.current_price = 90.0
+    assert position.calculate_pnl_all_buys().tolist() == [
+        position.calculate_pnl_for_transaction(0), position.calculate_pnl_for_transaction(2)
+    ] == [-100.0, -75.0]
+
+
+def test_portfolio_refresh_metrics_shares_one_date():
+    """refresh_metrics values every enhanced position at the same date and skips legacy ones"""
+    from datetime import date
+    from src.models.transaction_models import EnhancedPosition, PositionTransaction
+    from src.utils.xirr_calculator import TransactionType
+
+    enhanced = EnhancedPosition(symbol="TCS", current_price=3300.0)
+    enhanced.add_transaction(PositionTransaction(
+        date=date(2024, 1, 1), quantity=10, price=3000.0, transaction_type=TransactionType.BUY
+    ))
+    legacy = Position(symbol="INFY", quantity=5, avg_buy_price=1500.0, current_price=1600.0)
+    portfolio = Portfolio(cash=0.0, positions=[enhanced, legacy])
+
+    today = date(2024, 7, 1)
+    metrics = portfolio.refresh_metrics(today)
+    assert set(metrics) == {"TCS"}
+    assert metrics["TCS"] == enhanced.calculate_xirr(today)
+
+
+def test_portfolio_xirr_jobs_solve_off_position():
+    """Pending XIRR inputs solve without touching positions and memoize once stored back"""
+    from datetime import date
+    from src.models.transaction_models import EnhancedPosition, PositionTransaction
+    from src.utils.xirr_calculator import TransactionType
+
+    enhanced = EnhancedPosition(symbol="TCS", current_price=3300.0)
+    enhanced.add_transaction(PositionTransaction(
+        date=date(2024, 1, 1), quantity=10, price=3000.0, transaction_type=TransactionType.BUY
+    ))
+    portfolio = Portfolio(cash=0.0, positions=[enhanced])
+    today = date(2024, 7, 1)
+    expected = enhanced.calculate_xirr(today)
+    enhanced.store_xirr(None, None)  # Forget the memo
+
+    jobs = portfolio.pending_xirr_inputs(today)
+    assert [job[0] for job in jobs] == [enhanced]
+    results = [EnhancedPosition.solve_cash_flows(flows) for _, _, flows in jobs]
+    assert results == [expected]
+    portfolio.store_xirr_results(jobs, results)
+    assert portfolio.pending_xirr_inputs(today) == []
+    assert enhanced.calculate_xirr(today) == expected
+
+
+def test_enhanced_position_buy_only_fast_path():
+    """BUY-only positions value at market minus full cost basis until the first SELL"""
+    from datetime import date
+    from src.models.transaction_models import EnhancedPosition, PositionTransaction
+    from src.utils.xirr_calculator import TransactionType
+
+    position = EnhancedPosition(symbol="TCS", current_price=110.0)
+    position.add_transaction(PositionTransaction(
+        date=date(2024, 1, 1), quantity=10, price=100.0, transaction_type=TransactionType.BUY, commission=5.0
+    ))
+    assert position.get_fifo_sells() == []
+    assert position.unrealized_pnl == pytest.approx(1100.0 - 1005.0)
+
+    position.add_transaction(PositionTransaction(
+        date=date(2024, 2, 1), quantity=4, price=120.0, transaction_type=TransactionType.SELL
+    ))
+    assert len(position.get_fifo_sells()) == 1
+    assert position.unrealized_pnl == pytest.approx(6 * 110.0 - 6 * 100.5)
+
+
+def test_portfolio_position_table_matches_positions():
+    """position_table columns mirror each position's own metrics"""
+    from datetime import date
+    from src.models.transaction_models import EnhancedPosition, PositionTransaction
+    from src.utils.xirr_calculator import TransactionType
+
+    enhanced = EnhancedPosition(symbol="TCS", current_price=3300.0)
+    enhanced.add_transaction(PositionTransaction(
+        date=date(2024, 1, 1), quantity=10, price=3000.0, transaction_type=TransactionType.BUY
+    ))
+    legacy = Position(symbol="INFY", quantity=5, avg_buy_price=1500.0, current_price=1400.0)
+    portfolio = Portfolio(cash=0.0, positions=[enhanced, legacy])
+
+    table = portfolio.position_table()
+    assert table.symbol == ["TCS", "INFY"]
+    assert table.quantity.tolist() == [10, 5]
+    assert table.unrealized_pnl.tolist() == [enhanced.unrealized_pnl, legacy.unrealized_pnl]
+    assert table.unrealized_pnl_pct.tolist() == pytest.approx(
+        [enhanced.unrealized_pnl_pct, legacy.unrealized_pnl_pct]
+    )
+    assert Portfolio(cash=0.0).position_table().market_value.size == 0